@@ -4,10 +4,32 @@ Agent 循环框架 — 统一「触发 → 取项 → 处理一项 → 间隔」
 各角色（Kai 扫描器、Worker 扫描器、回收者、Keep 等）只需实现 trigger_fn 与 process_fn，
 由 run_loop 负责 while + sleep + once + 异常与 KeyboardInterrupt。
 """
+import os
+import sys
 import time
 import traceback
 from typing import Callable, Any, List
 
+# 提示词模板缓存: 路径 -> (st_mtime_ns, st_size, 内容)；文件被修改后自动重新读取
+_PROMPT_CACHE: dict[str, tuple[int, int, str]] = {}
+
+
+def _read_prompt_file(path) -> str | None:
+    """读取模板文件（不存在时返回 None）；mtime 与大小未变时直接返回缓存内容，只需一次 stat"""
+    key = str(path)
+    try:
+        st = os.stat(key)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    cached = _PROMPT_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    with open(key, encoding="utf-8") as f:
+        text = f.read()
+    _PROMPT_CACHE[key] = (st.st_mtime_ns, st.st_size, text)
+    return text
+
+
 # 延迟导入避免与 config 等循环依赖
 def load_prompt(template_name: str) -> str:
     """
@@ -29,15 +51,15 @@ def load_prompt(template_name: str) -> str:
     import secretary.config as cfg
     
     # 优先从自定义目录加载
-    if cfg.CUSTOM_PROMPTS_DIR.exists():
-        custom_path = cfg.CUSTOM_PROMPTS_DIR / template_name
-        if custom_path.exists():
-            return custom_path.read_text(encoding="utf-8")
+    text = _read_prompt_file(cfg.CUSTOM_PROMPTS_DIR / template_name)
+    if text is not None:
+        return text
     
     # 回退到包内默认目录
     default_path = cfg.PROMPTS_DIR / template_name
-    if default_path.exists():
-        return default_path.read_text(encoding="utf-8")
+    text = _read_prompt_file(default_path)
+    if text is not None:
+        return text
     
     # 都不存在，抛出异常
     raise FileNotFoundError(
@@ -46,6 +68,27 @@ def load_prompt(template_name: str) -> str:
     )
 
 
+def _report_exception(message: str, log_file: str | None, verbose: bool) -> None:
+    """记录当前正在处理的异常：堆栈只格式化一次，日志文件与终端各一次 write
+
+    traceback.print_exc 逐帧写出，后台 scanner 的 stderr 为无缓冲输出，每帧都是一次系统调用。
+    """
+    tb = traceback.format_exc()
+    if log_file:
+        try:
+            from datetime import datetime
+            from pathlib import Path
+            log_path = Path(log_file)
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(log_path, "a", encoding="utf-8") as log_f:
+                ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                log_f.write(f"\n[{ts}] ❌ {message}\n{tb}")
+        except Exception:
+            pass  # 日志写入失败不影响处理
+    if verbose:
+        sys.stderr.write(tb)
+
+
 def run_loop(
     trigger_fn: Callable[[], List[Any]],
     process_fn: Callable[[Any], Any],
@@ -56,6 +99,9 @@ def run_loop(
     on_exit: Callable[[], None] | None = None,
     on_idle: Callable[[], None] | None = None,
     log_file: str | None = None,
+    wait_fn: Callable[[float], None] | None = None,
+    max_batch: int = 1,
+    idle_interval_sec: float | None = None,
 ) -> None:
     """
     通用扫描循环：持续运行直到 KeyboardInterrupt 或 once=True
@@ -72,7 +118,8 @@ def run_loop(
       - 每个 process_fn 的异常都被捕获，不会中断循环
 
     - trigger_fn(): 返回待处理项列表，空列表表示本轮无工作。
-    - process_fn(item): 处理单条；返回值未使用，仅便于打日志。
+    - process_fn(item): 处理单条；返回真值表示该项已被消费（如已移出待处理目录），
+      配合 max_batch 可不经休眠直接进入下一轮。
     - interval_sec: 每轮结束后的休眠秒数。
     - once: True 时执行一轮后退出（仅用于测试或单次拉取）。
     - label: 用于日志前缀。
@@ -80,11 +127,22 @@ def run_loop(
     - on_exit: 正常或 KeyboardInterrupt 退出时调用的回调（如 update_worker_status(idle)）。
     - on_idle: 当 trigger_fn 返回空列表时调用（可选，用于打印「无任务」等）。
     - log_file: 可选的日志文件路径，用于写入错误信息。
+    - wait_fn: 可选的休眠函数 wait_fn(interval_sec)，可在有新工作时提前返回（如 DirWatcher.wait）；
+      默认 time.sleep。
+    - max_batch: 连续多少轮可以跳过休眠。本轮所有项都被消费时立即进入下一轮，以便一次排空积压的队列；
+      达到上限或有项未被消费（失败、需重试）时照常休眠。默认 1，即每轮之后都休眠。
+    - idle_interval_sec: trigger_fn 返回空列表（无工作）时的休眠秒数，默认同 interval_sec。
+      wait_fn 能在新工作到达时提前返回时，可设得更长，空闲期间几乎不再轮询。
     """
     cycle = 0
+    streak = 0  # 连续跳过休眠的轮数
+    if idle_interval_sec is None:
+        idle_interval_sec = interval_sec
     try:
         while True:
             cycle += 1
+            consumed = False
+            items = None
             try:
                 # 1. 检查触发条件
                 items = trigger_fn()
@@ -92,26 +150,15 @@ def run_loop(
                     on_idle()
                 
                 # 2. 执行动作（对每个触发项）
+                consumed = bool(items)
                 for item in items:
                     try:
-                        process_fn(item)
+                        if not process_fn(item):
+                            consumed = False
                     except Exception as e:
+                        consumed = False
                         # process_fn 中的异常不会导致循环退出
-                        if log_file:
-                            try:
-                                from datetime import datetime
-                                from pathlib import Path
-                                log_path = Path(log_file)
-                                log_path.parent.mkdir(parents=True, exist_ok=True)
-                                with open(log_path, "a", encoding="utf-8") as log_f:
-                                    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                    log_f.write(f"\n[{ts}] ❌ 处理项异常 (周期 {cycle}): {e}\n")
-                                    traceback.print_exc(file=log_f)
-                                    log_f.flush()
-                            except Exception:
-                                pass
-                        if verbose:
-                            traceback.print_exc()
+                        _report_exception(f"处理项异常 (周期 {cycle}): {e}", log_file, verbose)
                         # 继续处理下一个 item
                         continue
                 
@@ -120,28 +167,18 @@ def run_loop(
                     break
             except Exception as e:
                 # trigger_fn 或其他外层异常也不会导致循环退出
-                if log_file:
-                    try:
-                        from datetime import datetime
-                        from pathlib import Path
-                        log_path = Path(log_file)
-                        log_path.parent.mkdir(parents=True, exist_ok=True)
-                        with open(log_path, "a", encoding="utf-8") as log_f:
-                            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            log_f.write(f"\n[{ts}] ❌ 扫描循环异常 (周期 {cycle}): {e}\n")
-                            traceback.print_exc(file=log_f)
-                            log_f.flush()
-                    except Exception:
-                        pass  # 日志写入失败不影响处理
-                
-                if verbose:
-                    traceback.print_exc()
+                _report_exception(f"扫描循环异常 (周期 {cycle}): {e}", log_file, verbose)
                 # 单轮异常不退出，继续下一轮
             
             # 4. 休眠后继续下一轮（除非 once=True）
             if once:
                 break
-            time.sleep(interval_sec)
+            if consumed and streak + 1 < max_batch:
+                streak += 1
+                continue
+            streak = 0
+            idle = items is not None and not items  # trigger_fn 抛异常时 items 为 None，按常规间隔重试
+            (wait_fn or time.sleep)(idle_interval_sec if idle else interval_sec)
     except KeyboardInterrupt:
         if verbose:
             print(f"\n\n🛑 {label} 已停止 (共 {cycle} 个周期)")
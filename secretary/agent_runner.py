@@ -15,7 +15,7 @@ import os
 import time
 from dataclasses import dataclass, field
 
-from secretary.config import DEFAULT_MODEL
+import secretary.config as cfg
 
 
 @dataclass
@@ -55,9 +55,25 @@ class AgentResult:
     raw_output: str = ""       # 完整的原始 stream-json 输出 (用于对话日志)
 
 
-def _parse_stream_event(line: str, stats: RoundStats) -> str | None:
+def _decode_stream_event(line: str) -> dict | None:
+    """将一行输出解码为 stream-json 事件；非 JSON 行返回 None
+
+    事件总是 JSON 对象：不以 "{" 开头的行（Error:/Warning:/普通文本）直接判定为非 JSON，
+    不必让 json.loads 抛出再捕获异常。
+    """
+    if not line.startswith("{"):
+        return None
+    try:
+        evt = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return evt if isinstance(evt, dict) else None
+
+
+def _parse_stream_event(line: str, stats: RoundStats, evt: dict | None = None) -> str | None:
     """
     解析一行 stream-json 事件，更新统计，返回可读文本 (用于 verbose 输出)
+    调用方已解码过该行时可通过 evt 传入，避免重复解码。
 
     事件类型:
       system/init   — session_id, model
@@ -66,10 +82,10 @@ def _parse_stream_event(line: str, stats: RoundStats) -> str | None:
       thinking      — 思考过程 (delta)
       result        — 最终结果, duration_ms
     """
-    try:
-        evt = json.loads(line)
-    except json.JSONDecodeError:
-        return line.strip()  # 非 JSON 行原样返回
+    if evt is None:
+        evt = _decode_stream_event(line)
+        if evt is None:
+            return line.strip()  # 非 JSON 行原样返回
 
     evt_type = evt.get("type", "")
     subtype = evt.get("subtype", "")
@@ -189,7 +205,7 @@ def run_agent(
         if workspace:
             agent_cmd_parts.extend(["--workspace", str(workspace)])
         
-        effective_model = model or DEFAULT_MODEL
+        effective_model = model or cfg.DEFAULT_MODEL
         # 始终传递 --model 参数，包括 Auto
         if effective_model:
             agent_cmd_parts.extend(["--model", effective_model])
@@ -221,7 +237,7 @@ def run_agent(
         if workspace:
             cmd.extend(["--workspace", str(workspace)])
 
-        effective_model = model or DEFAULT_MODEL
+        effective_model = model or cfg.DEFAULT_MODEL
         # 始终传递 --model 参数，包括 Auto
         if effective_model:
             cmd.extend(["--model", effective_model])
@@ -278,7 +294,6 @@ def run_agent(
                     error_lines.append(stripped)
                     if verbose:
                         sys.stdout.write(f"  ❌ {stripped}\n")
-                        sys.stdout.flush()  # 实时刷新
                     continue
                 
                 # 过滤掉警告信息
@@ -286,31 +301,30 @@ def run_agent(
                     warning_count += 1
                     if verbose:
                         sys.stdout.write(f"  ⚠️  {stripped}\n")
-                        sys.stdout.flush()  # 实时刷新
                     continue
                 
-                # 尝试解析为JSON
-                is_json = False
-                try:
-                    evt = json.loads(stripped)
-                    is_json = True
+                # 尝试解析为JSON（每行只解码一次）
+                evt = _decode_stream_event(stripped)
+                if evt is not None:
                     json_lines.append(stripped)  # 收集JSON行用于格式化
                     # 解析 stream-json 事件并更新统计（但不输出，等待格式化）
-                    _parse_stream_event(stripped, stats)
-                except json.JSONDecodeError:
-                    # 非JSON行：解析并实时输出
-                    readable = _parse_stream_event(stripped, stats)
+                    _parse_stream_event(stripped, stats, evt)
+                else:
+                    # 非JSON行：原样实时输出
+                    readable = stripped
                     if readable:
                         output_lines.append(readable)
                     # 实时输出非JSON行
                     if verbose:
                         if readable:
                             sys.stdout.write(f"  │ {readable}\n")
-                            sys.stdout.flush()
                         elif stripped and not stripped.startswith("Warning:"):
                             sys.stdout.write(f"  │ {stripped}\n")
-                            sys.stdout.flush()
 
+        # 流式输出逐行只 write 不 flush（整行写入：终端行缓冲、后台 PYTHONUNBUFFERED 均会及时落盘），
+        # 一次调用结束时统一刷新一次
+        if verbose:
+            sys.stdout.flush()
         rc = proc.wait(timeout=timeout)
         dur = time.time() - start
 
@@ -320,9 +334,8 @@ def run_agent(
 
         # 格式化并输出JSON内容（美化输出）
         if verbose and json_lines:
-            from secretary.log_formatter import format_stream_json_to_conversation
-            json_content = "\n".join(json_lines)
-            formatted = format_stream_json_to_conversation(json_content)
+            from secretary.log_formatter import format_stream_json_lines
+            formatted = format_stream_json_lines(json_lines)
             if formatted:
                 # 输出格式化的对话内容
                 print()  # 空行分隔
@@ -360,13 +373,10 @@ def run_agent(
         for line in raw_lines:
             stripped = line.strip()
             if stripped and not stripped.startswith("Warning:"):
-                try:
-                    evt = json.loads(stripped)
-                    if evt.get("type") in ("system", "assistant", "tool_call", "result"):
-                        has_valid_json = True
-                        break
-                except json.JSONDecodeError:
-                    pass
+                evt = _decode_stream_event(stripped)
+                if evt is not None and evt.get("type") in ("system", "assistant", "tool_call", "result"):
+                    has_valid_json = True
+                    break
         
         has_valid_output = (
             stats.tool_call_count > 0 or 
@@ -15,6 +15,7 @@ from pathlib import Path
 from typing import List
 
 import secretary.config as cfg
+from secretary.fs_utils import count_files, has_files, latest_mtime, newest_files
 from secretary.agent_loop import load_prompt
 from secretary.agent_runner import run_agent
 from secretary.agents import _worker_tasks_dir, _worker_ongoing_dir, _worker_reports_dir
@@ -69,28 +70,14 @@ def _load_boss_max_executions(boss_dir: Path) -> int | None:
 
 def _get_boss_execution_count(boss_dir: Path) -> int:
     """获取 boss 已执行次数（从 stats 目录统计）"""
-    stats_dir = boss_dir / "stats"
-    if not stats_dir.exists():
-        return 0
-    # 统计 stats 目录中的任务统计文件数量
-    stats_files = list(stats_dir.glob("*-stats.json"))
-    return len(stats_files)
+    # 统计 stats 目录中的任务统计文件数量（目录不存在时为 0）
+    return count_files(boss_dir / "stats", "-stats.json")
 
 
 def _get_last_processed_report_time(boss_dir: Path) -> float:
     """获取 boss 最后处理报告的时间戳（从 stats 目录）"""
-    stats_dir = boss_dir / "stats"
-    if not stats_dir.exists():
-        return 0.0
-    
-    # 获取最新的 stats 文件的时间戳
-    stats_files = list(stats_dir.glob("*-stats.json"))
-    if not stats_files:
-        return 0.0
-    
-    # 返回最新文件的时间戳
-    latest_file = max(stats_files, key=lambda p: p.stat().st_mtime)
-    return latest_file.stat().st_mtime
+    # 最新的 stats 文件的时间戳（目录不存在或为空时为 0.0）
+    return latest_mtime(boss_dir / "stats", "-stats.json")
 
 
 def _get_completed_tasks_summary(worker_name: str) -> str:
@@ -100,7 +87,7 @@ def _get_completed_tasks_summary(worker_name: str) -> str:
     stats_dir = worker_dir / "stats"
     completed_tasks_info = []
     if stats_dir.exists():
-        for stats_file in sorted(stats_dir.glob("*-stats.json"), key=lambda p: p.stat().st_mtime, reverse=True)[:5]:
+        for stats_file in newest_files(stats_dir, "-stats.json", 5):
             try:
                 stats_data = json.loads(stats_file.read_text(encoding="utf-8"))
                 task_name = stats_file.stem.replace("-stats", "")
@@ -109,7 +96,7 @@ def _get_completed_tasks_summary(worker_name: str) -> str:
             except Exception:
                 pass
     if not completed_tasks_info and reports_dir.exists():
-        for report_file in sorted(reports_dir.glob("*-report.md"), key=lambda p: p.stat().st_mtime, reverse=True)[:5]:
+        for report_file in newest_files(reports_dir, "-report.md", 5):
             try:
                 content = report_file.read_text(encoding="utf-8")
                 title = report_file.stem.replace("-report", "")
@@ -141,7 +128,7 @@ def build_boss_prompt(task_file: Path, boss_dir: Path) -> str:
     # 精简的报告目录信息
     reports_info = f"\n## Worker 报告目录\n路径: `{w_reports}`\n"
     if w_reports.exists():
-        rfiles = sorted(w_reports.glob("*-report.md"), key=lambda p: p.stat().st_mtime, reverse=True)[:10]
+        rfiles = newest_files(w_reports, "-report.md", 10)
         if rfiles:
             reports_info += "\n".join(f"- {r.name}" for r in rfiles) + "\n"
 
@@ -173,8 +160,8 @@ def run_boss(task_file: Path, boss_dir: Path, verbose: bool = True) -> bool:
         return False
     worker_tasks_dir = _worker_tasks_dir(worker_name)
     worker_ongoing_dir = _worker_ongoing_dir(worker_name)
-    pending_count = len(list(worker_tasks_dir.glob("*.md"))) if worker_tasks_dir.exists() else 0
-    ongoing_count = len(list(worker_ongoing_dir.glob("*.md"))) if worker_ongoing_dir.exists() else 0
+    pending_count = count_files(worker_tasks_dir, ".md")
+    ongoing_count = count_files(worker_ongoing_dir, ".md")
     if pending_count > 0 or ongoing_count > 0:
         if verbose:
             print(f"ℹ️ Worker '{worker_name}' 队列不为空，无需生成新任务")
@@ -262,12 +249,9 @@ class BossAgent(AgentType):
                 return []
             
             # 检查自己的 tasks/（全局目标，通常是 goal.md）
-            boss_tasks_dir = config.input_dir
-            if boss_tasks_dir.exists():
-                goal_files = list(boss_tasks_dir.glob("*.md"))
-                if goal_files:
-                    # 有自己的任务（全局目标），触发
-                    return [config.base_dir / ".boss_trigger_marker"]
+            if has_files(config.input_dir, ".md"):
+                # 有自己的任务（全局目标），触发
+                return [config.base_dir / ".boss_trigger_marker"]
             
             # 也检查 goal.md 文件（如果存在）
             goal_file = config.base_dir / "goal.md"
@@ -280,17 +264,9 @@ class BossAgent(AgentType):
                 # 获取最近处理的报告文件时间戳（从 stats 目录）
                 last_processed_time = _get_last_processed_report_time(config.base_dir)
                 
-                # 查找新的报告文件
-                report_files = sorted(
-                    worker_reports_dir.glob("*-report.md"),
-                    key=lambda p: p.stat().st_mtime,
-                    reverse=True
-                )
-                
-                for report_file in report_files:
-                    if report_file.stat().st_mtime > last_processed_time:
-                        # 发现新报告，触发
-                        return [config.base_dir / ".boss_trigger_marker"]
+                # 最新报告比上次处理更新，说明有新报告，触发
+                if latest_mtime(worker_reports_dir, "-report.md") > last_processed_time:
+                    return [config.base_dir / ".boss_trigger_marker"]
             
             return []
         
@@ -8,14 +8,23 @@ Recycler 负责审查 Worker 的完成报告，判断任务是否真正完成，
 - 处理逻辑：调用 process_report 审查报告，移动到 solved/ 或 unsolved/
 - 会话管理：每次都是新会话（单次执行）
 """
+import errno
+import os
+import re
 import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
 import secretary.config as cfg
 from secretary.config import BASE_DIR, AGENTS_DIR, RECYCLER_INTERVAL
-from secretary.agent_loop import load_prompt, run_loop
+from secretary.agent_loop import _report_exception, load_prompt, run_loop
 from secretary.agent_runner import run_agent
+from secretary.agents import _worker_memory_file, list_workers
+from secretary.fs_utils import cached_files_by_mtime
 from secretary.agent_config import (
     AgentConfig, TerminationCondition, TriggerCondition, TriggerConfig
 )
@@ -27,43 +36,56 @@ from secretary.agent_types.base import AgentType
 # ============================================================
 
 def _find_report_files() -> List[Path]:
-    """从所有 agent 的 reports 目录中找到所有报告文件 (*-report.md)"""
-    reports = []
-    if not AGENTS_DIR.exists():
+    """从所有 agent 的 reports 目录中找到所有报告文件 (*-report.md)，按修改时间从早到晚
+
+    agent 目录与各 reports 目录都只 scandir 一次，mtime 随遍历取得，排序时不再逐个 stat；
+    reports 目录自上一轮以来没有报告移入/移出时，直接复用上一轮的列表，只需一次 stat。
+    """
+    try:
+        it = os.scandir(AGENTS_DIR)
+    except (FileNotFoundError, NotADirectoryError):
         return []
-    for agent_dir in AGENTS_DIR.iterdir():
-        if not agent_dir.is_dir() or agent_dir.name.startswith("."):
-            continue
-        reports_dir = agent_dir / "reports"
-        if reports_dir.exists():
-            agent_reports = [f for f in reports_dir.glob("*-report.md") if f.is_file()]
-            reports.extend(agent_reports)
-    return sorted(reports, key=lambda p: p.stat().st_mtime)
+    entries = []
+    with it:
+        for agent_dir in it:
+            if agent_dir.name.startswith(".") or not agent_dir.is_dir():
+                continue
+            entries.extend(cached_files_by_mtime(AGENTS_DIR / agent_dir.name / "reports", "-report.md"))
+    entries.sort()
+    return [report for _, report in entries]
+
+
+def _report_stats_dir(report_file: Path) -> Path | None:
+    """报告所属 agent 的 stats 目录；报告路径形如 <agents>/<agent>/reports/<task>-report.md
+
+    直接取父目录名，不在完整的 Path.parts 中查找 "agents"（工作区路径本身含 agents 时也不会取错）。
+    """
+    reports_dir = report_file.parent
+    if reports_dir.name != "reports":
+        return None
+    return AGENTS_DIR / reports_dir.parent.name / "stats"
 
 
 def _get_related_files(report_file: Path) -> List[Path]:
     """获取与报告关联的统计文件 (stats 目录下)"""
+    stats_dir = _report_stats_dir(report_file)
+    if stats_dir is None:
+        return []
     base_name = report_file.stem.replace("-report", "")
     related = []
-    parts = report_file.parts
-    if "agents" in parts and "reports" in parts:
-        try:
-            agents_idx = parts.index("agents")
-            if agents_idx + 1 < len(parts):
-                agent_name = parts[agents_idx + 1]
-                agent_dir = AGENTS_DIR / agent_name
-                stats_dir = agent_dir / "stats"
-                for suffix in ["-stats.md", "-stats.json"]:
-                    f = stats_dir / f"{base_name}{suffix}"
-                    if f.exists():
-                        related.append(f)
-        except (ValueError, IndexError):
-            pass
+    for suffix in ("-stats.md", "-stats.json", "-conversation.jsonl"):
+        f = stats_dir / f"{base_name}{suffix}"
+        if f.exists():
+            related.append(f)
     return related
 
 
+@lru_cache(maxsize=None)
 def _get_recycler_dirs(recycler_name: str = "recycler") -> tuple[Path, Path]:
-    """获取 recycler 的 solved 和 unsolved 目录"""
+    """获取 recycler 的 solved 和 unsolved 目录
+
+    每个 recycler 只在首次调用时创建目录，之后直接返回缓存的路径，审查每份报告不再重复 mkdir。
+    """
     recycler_dir = AGENTS_DIR / recycler_name
     solved_dir = recycler_dir / "solved"
     unsolved_dir = recycler_dir / "unsolved"
@@ -72,34 +94,22 @@ def _get_recycler_dirs(recycler_name: str = "recycler") -> tuple[Path, Path]:
     return solved_dir, unsolved_dir
 
 
-def build_recycler_prompt(report_file: Path, recycler_name: str = "recycler") -> str:
-    """构建回收者 Agent 的提示词"""
-    report_content = report_file.read_text(encoding="utf-8")
+def build_recycler_prompt(report_file: Path, recycler_name: str = "recycler",
+                          report_content: str | None = None) -> str:
+    """构建回收者 Agent 的提示词（调用方已读取报告时通过 report_content 传入，避免重复读取）"""
+    if report_content is None:
+        report_content = report_file.read_text(encoding="utf-8")
     task_name = report_file.stem.replace("-report", "")
     recycler_dir = AGENTS_DIR / recycler_name
     recycler_reports_dir = recycler_dir / "reports"
-    stats_dir = None
-    parts = report_file.parts
-    if "agents" in parts and "reports" in parts:
-        try:
-            agents_idx = parts.index("agents")
-            if agents_idx + 1 < len(parts):
-                agent_name = parts[agents_idx + 1]
-                stats_dir = AGENTS_DIR / agent_name / "stats"
-        except (ValueError, IndexError):
-            pass
-    if stats_dir is None:
-        stats_dir = AGENTS_DIR / recycler_name / "stats"
+    stats_dir = _report_stats_dir(report_file) or AGENTS_DIR / recycler_name / "stats"
     stats_md = stats_dir / f"{task_name}-stats.md"
-    stats_json = stats_dir / f"{task_name}-stats.json"
-    stats_section = ""
-    if stats_md.exists():
+    try:
         stats_section = "## 执行统计数据\n\n---\n" + stats_md.read_text(encoding="utf-8") + "\n---\n"
-    else:
+    except FileNotFoundError:
         stats_section = "(无统计数据；此任务在统计功能上线前完成)\n"
     solved_dir, unsolved_dir = _get_recycler_dirs(recycler_name)
     reason_filename = f"{task_name}-unsolved-reason.md"
-    from secretary.agents import _worker_memory_file
     memory_file_path = _worker_memory_file(recycler_name)
     template = load_prompt("recycler.md")
     return template.format(
@@ -109,40 +119,133 @@ def build_recycler_prompt(report_file: Path, recycler_name: str = "recycler") ->
         stats_section=stats_section,
         solved_dir=solved_dir,
         unsolved_dir=unsolved_dir,
-        memory_file_path=memory_file_path_section,
+        memory_file_path=memory_file_path,
         reason_filename=reason_filename,
         recycler_reports_dir=recycler_reports_dir,
     )
 
 
+def _replace(src: Path, dest: Path):
+    """os.replace；跨文件系统 (EXDEV) 时退回 shutil.move"""
+    try:
+        os.replace(src, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(src), str(dest))
+
+
+def _move(src: Path, dest: Path):
+    """移动文件：solved/unsolved 与各 agent 目录同在工作区下，通常一次 rename 即可；
+    跨文件系统 (EXDEV) 时退回 shutil.move 的复制+删除
+
+    _get_recycler_dirs 只在首次调用时建目录；目标目录在运行期间被删除（如手动清理）时重建后重试一次。
+    """
+    try:
+        _replace(src, dest)
+    except FileNotFoundError:
+        if not src.exists() or dest.parent.exists():
+            raise
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        _replace(src, dest)
+
+
 def _move_related_stats(report_file: Path, dest_dir: Path):
     """确保 stats 中的关联文件也移到目标目录"""
     for f in _get_related_files(report_file):
         dest = dest_dir / f.name
         if not dest.exists():
             try:
-                shutil.move(str(f), str(dest))
+                _move(f, dest)
             except Exception:
                 pass
 
 
-def _ensure_unsolved_reason_record(task_name: str, unsolved_dir: Path | None = None, reason_content: str | None = None):
-    """确保 unsolved 中对该任务有 *-unsolved-reason.md 记录"""
+def _ensure_unsolved_reason_record(task_name: str, unsolved_dir: Path | None = None,
+                                   reason_content: str | None = None) -> str | None:
+    """确保 unsolved 中对该任务有 *-unsolved-reason.md 记录
+
+    返回本次写入的内容；记录已存在（通常由 Agent 写好）时返回 None，内容需由调用方自行读取。
+    """
     if unsolved_dir is None:
         _, unsolved_dir = _get_recycler_dirs()
-    unsolved_dir.mkdir(parents=True, exist_ok=True)
     reason_file = unsolved_dir / f"{task_name}-unsolved-reason.md"
-    if reason_file.exists():
-        return
     default = "# 未完成原因\n\n（回收者判定为未完成。）\n\n# 下一步改进方向\n\n请根据报告内容与实际情况，明确需要补充或修正的部分。\n"
-    reason_file.write_text(reason_content or default, encoding="utf-8")
+    # "x" 模式 (O_CREAT|O_EXCL)：存在性检查与创建合为一次原子 open，Agent 已写好的记录不会被覆盖
+    content = reason_content or default
+    for attempt in range(2):
+        try:
+            with open(reason_file, "x", encoding="utf-8") as f:
+                f.write(content)
+        except FileExistsError:
+            return None
+        except FileNotFoundError:
+            if attempt:
+                raise
+            unsolved_dir.mkdir(parents=True, exist_ok=True)  # unsolved 目录在运行期间被删除，重建后重试
+            continue
+        return content
 
 
-def _resubmit_task(task_name: str, report_content: str = "", verbose: bool = True):
-    """调用秘书 Agent 重新提交未完成的任务"""
-    _, unsolved_dir = _get_recycler_dirs()
-    reason_file = unsolved_dir / f"{task_name}-unsolved-reason.md"
-    reason = reason_file.read_text(encoding="utf-8").strip() if reason_file.exists() else ""
+# 串行化重新提交：secretary 的选择与任务文件写入（任务文件名按毫秒时间戳生成）
+_RESUBMIT_LOCK = threading.Lock()
+
+
+def _choose_secretary(verbose: bool = True) -> str | None:
+    """选择接收重新提交任务的 secretary：只有一个时直接使用，多个时交互选择；没有时返回 None
+
+    后台运行（stdin 不是终端）时不弹出交互提示，直接使用第一个 secretary。
+    """
+    secretaries = [w for w in list_workers() if w.get("type") == "secretary"]
+    if not secretaries:
+        if verbose:
+            print("   ⚠️ 没有可用的 secretary agent，无法重新提交任务")
+        return None
+    if len(secretaries) == 1 or not sys.stdin.isatty():
+        return secretaries[0]["name"]
+    from secretary.cli import _select_secretary
+    return _select_secretary(secretaries) or secretaries[0]["name"]
+
+
+class _SecretaryChoice:
+    """一批审查共用的 secretary 选择：第一次真正需要重新提交时才选定，之后复用
+
+    只在持有 _RESUBMIT_LOCK 时调用 get()，并发审查的各线程不会同时弹出选择提示。
+    """
+
+    def __init__(self):
+        self._chosen = False
+        self._name: str | None = None
+
+    def get(self, verbose: bool) -> str | None:
+        if not self._chosen:
+            self._name = _choose_secretary(verbose)
+            self._chosen = True
+        return self._name
+
+
+def _resubmit_task(task_name: str, report_content: str = "", verbose: bool = True,
+                   resubmitted: set[str] | None = None, reason: str | None = None,
+                   secretary: _SecretaryChoice | None = None):
+    """调用秘书 Agent 重新提交未完成的任务
+
+    resubmitted 为本轮已重新提交的任务名集合：同一轮中同名任务只提交一次。
+    reason 为刚写入的未完成原因（见 _ensure_unsolved_reason_record）；为 None 时从 unsolved 目录读取。
+    secretary 为本批审查共用的 secretary 选择（见 _SecretaryChoice）；为 None 时每次单独选择。
+    """
+    if resubmitted is not None:
+        if task_name in resubmitted:
+            if verbose:
+                print(f"   ℹ️ 本轮已重新提交过 {task_name}，跳过")
+            return
+        resubmitted.add(task_name)
+    if reason is None:
+        _, unsolved_dir = _get_recycler_dirs()
+        try:
+            reason = (unsolved_dir / f"{task_name}-unsolved-reason.md").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            reason = ""
+    reason = reason.strip()
     parts = [f"之前的任务 `{task_name}` 经回收者审查判定为**未完成**，需要重新提交。\n"]
     if reason:
         parts.append(f"## 回收者的审查意见与改进方向\n\n{reason}\n")
@@ -154,48 +257,64 @@ def _resubmit_task(task_name: str, report_content: str = "", verbose: bool = Tru
     if verbose:
         print(f"   📨 重新提交任务: {task_name}")
     try:
-        from secretary.agents import list_workers
-        from secretary.cli import _write_kai_task, _select_secretary
-        secretaries = [w for w in list_workers() if w.get("type") == "secretary"]
-        if not secretaries:
-            if verbose:
-                print("   ⚠️ 没有可用的 secretary agent，无法重新提交任务")
-            return
-        secretary_name = secretaries[0]["name"] if len(secretaries) == 1 else _select_secretary(secretaries) or secretaries[0]["name"]
-        _write_kai_task(resubmit_request, secretary_name=secretary_name)
+        from secretary.cli import _write_kai_task
+        with _RESUBMIT_LOCK:
+            secretary_name = secretary.get(verbose) if secretary is not None else _choose_secretary(verbose)
+            if secretary_name is None:
+                return
+            _write_kai_task(resubmit_request, secretary_name=secretary_name)
     except Exception:
         if verbose:
             print("   ⚠️ 重新提交任务失败")
         raise
 
 
+# 兜底判定关键词：未完成类优先于已完成类（"unsolved" 本身也包含 "solved"）
+_VERDICT_RE = re.compile(r"(?P<unsolved>未完成|unsolved)|已完成|solved", re.IGNORECASE)
+
+
+def _scan_verdict(agent_output: str) -> str | None:
+    """单遍扫描 Agent 输出中的判定关键词：返回 "unsolved" / "solved"，都未出现时返回 None
+
+    出现任一未完成类关键词即可确定结果并停止扫描；无需为大小写不敏感匹配复制整段输出。
+    """
+    verdict = None
+    for m in _VERDICT_RE.finditer(agent_output):
+        if m.lastgroup == "unsolved":
+            return "unsolved"
+        verdict = "solved"
+    return verdict
+
+
 def _fallback_judgment(report_file: Path, agent_output: str, task_name: str,
-                      report_content: str, verbose: bool, recycler_name: str = "recycler") -> bool:
+                      report_content: str, verbose: bool, recycler_name: str = "recycler",
+                      resubmitted: set[str] | None = None, secretary: _SecretaryChoice | None = None) -> bool:
     """当 Agent 没有移动文件时，根据输出文本做兜底判定"""
-    is_solved = "已完成" in agent_output or "solved" in agent_output.lower()
-    is_unsolved = "未完成" in agent_output or "unsolved" in agent_output.lower()
+    verdict = _scan_verdict(agent_output)
+    is_solved = verdict == "solved"
+    is_unsolved = verdict == "unsolved"
     related = _get_related_files(report_file)
     solved_dir, unsolved_dir = _get_recycler_dirs(recycler_name)
     if is_unsolved:
         dest = unsolved_dir / report_file.name
-        unsolved_dir.mkdir(parents=True, exist_ok=True)
-        shutil.move(str(report_file), str(dest))
+        _move(report_file, dest)
         for f in related:
             try:
-                shutil.move(str(f), str(unsolved_dir / f.name))
+                _move(f, unsolved_dir / f.name)
             except Exception:
                 pass
-        _ensure_unsolved_reason_record(task_name, unsolved_dir=unsolved_dir)
+        reason = _ensure_unsolved_reason_record(task_name, unsolved_dir=unsolved_dir)
         if verbose:
             print(f"   ℹ️ 兜底判定: 未完成 → {unsolved_dir.name}/")
-        _resubmit_task(task_name, report_content=report_content, verbose=verbose)
+        _resubmit_task(task_name, report_content=report_content, verbose=verbose, resubmitted=resubmitted,
+                       reason=reason, secretary=secretary)
         return True
     if is_solved:
         dest = solved_dir / report_file.name
-        shutil.move(str(report_file), str(dest))
+        _move(report_file, dest)
         for f in related:
             try:
-                shutil.move(str(f), str(solved_dir / f.name))
+                _move(f, solved_dir / f.name)
             except Exception:
                 pass
         if verbose:
@@ -206,14 +325,25 @@ def _fallback_judgment(report_file: Path, agent_output: str, task_name: str,
     return False
 
 
-def process_report(report_file: Path, recycler_config: AgentConfig | None = None, verbose: bool = True) -> bool:
-    """对一份报告调用回收者 Agent 进行审查。返回 True=已处理，False=处理失败"""
+def process_report(report_file: Path, recycler_config: AgentConfig | None = None, verbose: bool = True,
+                   resubmitted: set[str] | None = None, secretary: _SecretaryChoice | None = None) -> bool:
+    """对一份报告调用回收者 Agent 进行审查。返回 True=已处理，False=处理失败
+
+    resubmitted: 批量审查时由调用方传入的本轮已重新提交任务名集合（见 _resubmit_task）。
+    secretary: 批量审查时由调用方传入的共用 secretary 选择；为 None 时在需要重新提交时单独选择。
+    """
     task_name = report_file.stem.replace("-report", "")
     recycler_name = recycler_config.name if recycler_config else "recycler"
-    report_content = report_file.read_text(encoding="utf-8") if report_file.exists() else ""
+    # 报告只读取一次，提示词构建与重新提交都复用这份内容
+    try:
+        report_content = report_file.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        if verbose:
+            print(f"\n⚠️ 报告已不存在，跳过: {report_file.name}")
+        return False
     if verbose:
         print(f"\n🔍 回收者审查: {report_file.name}")
-    prompt = build_recycler_prompt(report_file, recycler_name=recycler_name)
+    prompt = build_recycler_prompt(report_file, recycler_name=recycler_name, report_content=report_content)
     result = run_agent(prompt=prompt, workspace=str(cfg.get_workspace()), verbose=verbose)
     if not result.success:
         print(f"   ❌ 回收者 Agent 调用失败: {result.output[:200]}")
@@ -229,16 +359,59 @@ def process_report(report_file: Path, recycler_config: AgentConfig | None = None
         return True
     if in_unsolved:
         _move_related_stats(report_file, unsolved_dir)
-        _ensure_unsolved_reason_record(task_name, unsolved_dir=unsolved_dir)
+        reason = _ensure_unsolved_reason_record(task_name, unsolved_dir=unsolved_dir)
         if verbose:
             print(f"   ✅ 判定: 未完成 → {unsolved_dir.name}/")
-        _resubmit_task(task_name, report_content=report_content, verbose=verbose)
+        _resubmit_task(task_name, report_content=report_content, verbose=verbose, resubmitted=resubmitted,
+                       reason=reason, secretary=secretary)
         return True
     if report_gone:
         if verbose:
             print("   ⚠️ 报告已被移动（Agent 已处理）")
         return True
-    return _fallback_judgment(report_file, result.output, task_name, report_content, verbose, recycler_name)
+    return _fallback_judgment(report_file, result.output, task_name, report_content, verbose, recycler_name,
+                              resubmitted=resubmitted, secretary=secretary)
+
+
+def _process_report_isolated(report_file: Path, recycler_config: AgentConfig, verbose: bool,
+                             resubmitted: set[str], secretary: _SecretaryChoice | None = None) -> bool:
+    """审查单份报告，异常只记录不外抛（视为未处理），避免一份坏报告阻塞同批其余报告"""
+    try:
+        return process_report(report_file, recycler_config=recycler_config, verbose=verbose,
+                              resubmitted=resubmitted, secretary=secretary)
+    except Exception:
+        if verbose:
+            print(f"   ❌ 处理报告出错: {report_file.name}")
+        _report_exception(f"处理报告出错: {report_file.name}", None, verbose)
+        return False
+
+
+def _process_reports(reports: List[Path], recycler_config: AgentConfig, verbose: bool = True) -> int:
+    """审查一批报告，返回已处理的份数
+
+    各报告相互独立，耗时主要在等待回收者 Agent：RECYCLER_CONCURRENCY > 1 时以线程池并发审查。
+    不同 agent 的同名报告会移动到同一个 solved/unsolved 路径，同一批中每个任务名只取最早的一份，
+    其余留到下一轮。单份报告出错只计为未处理，不影响同批其余报告。
+    """
+    workers = cfg.RECYCLER_CONCURRENCY
+    resubmitted: set[str] = set()
+    # secretary 在本批第一次真正重新提交时才选定，全部判定为已完成时不会提示
+    secretary = _SecretaryChoice()
+    if workers <= 1 or len(reports) <= 1:
+        return sum(1 for r in reports
+                   if _process_report_isolated(r, recycler_config, verbose, resubmitted, secretary))
+    seen = set()
+    batch = []
+    for r in reports:
+        task_name = r.stem.replace("-report", "")
+        if task_name not in seen:
+            seen.add(task_name)
+            batch.append(r)
+    with ThreadPoolExecutor(max_workers=min(workers, len(batch))) as pool:
+        # 同一批中任务名互不相同，各线程不会同时检查/写入 resubmitted 中的同一个名字
+        results = pool.map(lambda r: _process_report_isolated(r, recycler_config, verbose, resubmitted,
+                                                              secretary), batch)
+        return sum(1 for ok in results if ok)
 
 
 def run_recycler(once: bool = False, verbose: bool = True, recycler_name: str = "recycler") -> None:
@@ -248,10 +421,12 @@ def run_recycler(once: bool = False, verbose: bool = True, recycler_name: str =
     config = recycler_type.build_config(cfg.BASE_DIR, recycler_name)
 
     def trigger_fn():
-        return _find_report_files()
+        # 整批报告作为一项交给 process_fn，由 _process_reports 决定串行还是并发
+        reports = _find_report_files()
+        return [reports] if reports else []
 
-    def process_fn(report_path: Path):
-        process_report(report_path, recycler_config=config, verbose=verbose)
+    def process_fn(reports: List[Path]):
+        _process_reports(reports, config, verbose=verbose)
 
     run_loop(
         trigger_fn,
@@ -8,7 +8,8 @@ Secretary 负责任务的分类、归并和分配，特点：
 - 处理逻辑：读取任务，调用 run_secretary 处理，将分配结果写入 worker 的 input_dir
 - 会话管理：每次都是新会话（单次执行）
 """
-import shutil
+import re
+import sys
 import traceback
 from pathlib import Path
 from datetime import datetime
@@ -21,6 +22,11 @@ from secretary.agent_config import (
 )
 from secretary.agent_types.base import AgentType
 
+_SEP = "=" * 60
+
+# 文本中第一行非空内容（从首个非空白字符到行尾），无需把整份任务文件按行拆分
+_FIRST_LINE_RE = re.compile(r"\S[^\r\n]*")
+
 
 # ============================================================
 #  秘书执行逻辑（供 scanner 与类型内部使用）
@@ -89,6 +95,9 @@ def _load_existing_tasks_summary() -> str:
         if not workers:
             return ""
         for w in workers:
+            # list_workers 已统计过队列长度，空队列无需再扫描目录
+            if not w.get("pending_count"):
+                continue
             wt = _worker_tasks_dir(w["name"])
             if wt.exists():
                 md_files = sorted(wt.glob("*.md"))
@@ -97,7 +106,9 @@ def _load_existing_tasks_summary() -> str:
                     for f in md_files:
                         first_line = ""
                         try:
-                            first_line = f.read_text(encoding="utf-8").strip().splitlines()[0][:100]
+                            m = _FIRST_LINE_RE.search(f.read_text(encoding="utf-8"))
+                            if m:
+                                first_line = m.group(0)[:100]
                         except Exception:
                             pass
                         lines.append(f"- `{f.name}`: {first_line}")
@@ -108,7 +119,7 @@ def _load_existing_tasks_summary() -> str:
 
 def _append_memory(user_request: str, agent_output: str, secretary_name: str):
     """将本次调用的摘要追加到记忆文件"""
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    now = _now_str()
     memory_file = cfg.AGENTS_DIR / secretary_name / "memory.md"
     if not memory_file.exists():
         memory_file.parent.mkdir(parents=True, exist_ok=True)
@@ -197,6 +208,17 @@ def run_secretary(user_request: str, verbose: bool = True, secretary_name: str =
     return result.success
 
 
+def _now_str() -> str:
+    """当前时间 "YYYY-MM-DD HH:MM:SS"（isoformat 与 strftime 输出一致，但无需解析格式串）"""
+    return datetime.now().isoformat(sep=" ", timespec="seconds")
+
+
+def _write_banner(title: str) -> None:
+    """输出一段带分隔线的横幅（单次 write + flush）"""
+    sys.stdout.write(f"\n{_SEP}\n{title}\n{_SEP}\n\n")
+    sys.stdout.flush()
+
+
 # ============================================================
 #  Agent 类型定义
 # ============================================================
@@ -254,37 +276,35 @@ class SecretaryAgent(AgentType):
         try:
             request = task_file.read_text(encoding="utf-8").strip()
         except Exception as e:
-            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            ts = _now_str()
             print(f"\n[{ts}] ❌ 读取任务文件失败: {task_file.name} | 错误: {e}")
             traceback.print_exc()
             if task_file.exists():
                 error_file = config.output_dir / f"error-{task_file.name}"
-                shutil.move(str(task_file), str(error_file))
+                task_file.replace(error_file)
             return
 
+        # tasks/ 与 assigned/ 同在 agent 目录下（同一文件系统），一次 rename 即可，无需 shutil.move 的复制回退
         assigned_file = config.output_dir / task_file.name
         try:
-            shutil.move(str(task_file), str(assigned_file))
+            task_file.replace(assigned_file)
         except Exception as e:
-            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            ts = _now_str()
             print(f"\n[{ts}] ❌ 移动任务文件失败: {task_file.name} | 错误: {e}")
             traceback.print_exc()
             return
 
         # 直接运行，输出会自动重定向到日志文件
-        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print("\n" + "=" * 60)
-        print(f"[{ts}] 处理任务: {task_file.name}")
-        print("=" * 60 + "\n")
+        # 分隔横幅拼成一整段一次写出（后台日志为无缓冲输出，逐行 print 会产生多次 write）
+        ts = _now_str()
+        _write_banner(f"[{ts}] 处理任务: {task_file.name}")
         try:
             secretary_name = config.name
             run_secretary(request, verbose=True, secretary_name=secretary_name)
-            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print("\n" + "=" * 60)
-            print(f"[{ts}] 任务完成: {task_file.name}")
-            print("=" * 60 + "\n")
+            ts = _now_str()
+            _write_banner(f"[{ts}] 任务完成: {task_file.name}")
         except Exception as e:
-            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            ts = _now_str()
             print(f"\n[{ts}] ⚠️ 处理任务时发生错误: {e}")
             traceback.print_exc()
             raise
@@ -23,6 +23,7 @@ from datetime import datetime
 from pathlib import Path
 
 import secretary.config as cfg
+from secretary.fs_utils import count_many
 
 
 # ============================================================
@@ -208,17 +209,30 @@ def remove_worker(worker_name: str) -> bool:
     return True
 
 
+def _queue_dirs(agent_name: str) -> tuple[Path, Path]:
+    """agent 的待处理 (tasks/) 与执行中 (ongoing/) 目录"""
+    return _worker_tasks_dir(agent_name), _worker_ongoing_dir(agent_name)
+
+
+def _queue_counts(agent_name: str) -> tuple[int, int]:
+    """统计 agent 的待处理与执行中任务数，每个目录只扫描一次"""
+    pending, ongoing = count_many(list(_queue_dirs(agent_name)), ".md")
+    return pending, ongoing
+
+
 def list_workers() -> list[dict]:
     """列出所有已注册的 agent"""
     reg = _load_registry()
+    items = sorted(reg["workers"].items())
+    # 所有 agent 的 tasks/ongoing 目录一次性批量统计
+    dirs = [d for name, _ in items for d in _queue_dirs(name)]
+    counts = count_many(dirs, ".md")
     workers = []
-    for name, info in sorted(reg["workers"].items()):
+    for i, (name, info) in enumerate(items):
         # 补充实时信息
         info = dict(info)  # copy
-        td = _worker_tasks_dir(name)
-        od = _worker_ongoing_dir(name)
-        info["pending_count"] = len(list(td.glob("*.md"))) if td.exists() else 0
-        info["ongoing_count"] = len(list(od.glob("*.md"))) if od.exists() else 0
+        info["pending_count"] = counts[2 * i]
+        info["ongoing_count"] = counts[2 * i + 1]
         workers.append(info)
     return workers
 
@@ -229,10 +243,7 @@ def get_worker(worker_name: str) -> dict | None:
     if worker_name not in reg["workers"]:
         return None
     info = dict(reg["workers"][worker_name])
-    td = _worker_tasks_dir(worker_name)
-    od = _worker_ongoing_dir(worker_name)
-    info["pending_count"] = len(list(td.glob("*.md"))) if td.exists() else 0
-    info["ongoing_count"] = len(list(od.glob("*.md"))) if od.exists() else 0
+    info["pending_count"], info["ongoing_count"] = _queue_counts(worker_name)
     return info
 
 
@@ -25,6 +25,7 @@ from pathlib import Path
 from datetime import datetime
 
 import secretary.config as cfg
+from secretary.fs_utils import publish_file
 from secretary.settings import (
     get_cli_name, set_cli_name, get_base_dir, set_base_dir,
     get_model, set_model, get_language, load_settings,
@@ -144,7 +145,7 @@ def _auto_start_agents(silent: bool = True) -> int:
     started_count = 0
     
     # 先同步agents.json中的进程到队列（确保队列完整）
-    _sync_processes_to_queue()
+    _sync_processes_to_queue(workers)
     
     for worker in workers:
         agent_name = worker.get("name")
@@ -177,10 +178,14 @@ def _auto_start_agents(silent: bool = True) -> int:
     return started_count
 
 
-def _sync_processes_to_queue():
-    """同步agents.json中的进程到全局队列（确保队列完整）"""
-    from secretary.agents import list_workers
-    workers = list_workers()
+def _sync_processes_to_queue(workers: list[dict] | None = None):
+    """同步agents.json中的进程到全局队列（确保队列完整）
+
+    调用方已持有本轮的 list_workers() 结果时可直接传入，避免重复读取注册表与扫描队列目录。
+    """
+    if workers is None:
+        from secretary.agents import list_workers
+        workers = list_workers()
     
     for worker in workers:
         agent_name = worker.get("name")
@@ -270,19 +275,19 @@ def _start_agent_scanner(agent_name: str, agent_type: str, silent: bool = False)
             # 其他类型（worker, boss 或自定义类型）使用统一的 scanner
             sub_cmd = [sys.executable, "-m", "secretary.scanner", "--agent", agent_name, "--type", agent_type, "--quiet"]
         
-        # 打开日志文件用于重定向输出
-        log_file_handle = open(scanner_log_file, "a", encoding="utf-8", buffering=1)
-        
-        proc = subprocess.Popen(
-            sub_cmd,
-            stdout=log_file_handle,
-            stderr=subprocess.STDOUT,
-            cwd=cfg.BASE_DIR,
-            env=env,
-            bufsize=1,
-        )
-        
-        # 不关闭文件句柄，让进程持续写入
+        # 以追加模式打开原始 fd 交给子进程：父进程自己从不写日志，无需 Python 层的文本缓冲包装
+        log_fd = os.open(scanner_log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            proc = subprocess.Popen(
+                sub_cmd,
+                stdout=log_fd,
+                stderr=subprocess.STDOUT,
+                cwd=cfg.BASE_DIR_STR,
+                env=env,
+            )
+        finally:
+            # 子进程已继承该 fd，父进程的副本可立即关闭（避免每启动一个 agent 泄漏一个句柄）
+            os.close(log_fd)
         
         # 更新状态和注册进程
         update_worker_status(agent_name, "busy", pid=proc.pid)
@@ -321,12 +326,16 @@ def _write_kai_task(request: str, min_time: int = 0, secretary_name: str = "kai"
     tasks_dir = _worker_tasks_dir(secretary_name)
     tasks_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
-    task_file_name = f"task-{timestamp}.md"
-    task_file = tasks_dir / task_file_name
+    task_file = tasks_dir / f"task-{timestamp}.md"
+    # 同一毫秒内连续提交时追加序号，避免覆盖前一个任务文件
+    seq = 1
+    while task_file.exists():
+        task_file = tasks_dir / f"task-{timestamp}-{seq}.md"
+        seq += 1
     task_content = request
     if min_time > 0:
         task_content += f"\n\n<!-- min_time: {min_time} -->\n"
-    task_file.write_text(task_content, encoding="utf-8")
+    publish_file(task_file, task_content)
     return task_file
 
 
@@ -452,7 +461,7 @@ def _submit_task(request: str, min_time: int = 0, worker_name: str | None = None
         if min_time > 0:
             task_content += f"\n<!-- min_time: {min_time} -->\n"
         
-        task_file.write_text(task_content, encoding="utf-8")
+        publish_file(task_file, task_content)
         
         print(f"\n📨 任务已直接分配给 worker '{worker_name}'")
         print(f"   ✅ 任务文件: {worker_name}/{task_file_name}")
@@ -802,7 +811,7 @@ def cmd_workers(args):
     workers = list_workers()
     name = _cli_name()
 
-    _sync_processes_to_queue()
+    _sync_processes_to_queue(workers)
     active_procs = _get_active_processes()
     proc_pid_map = {p.get("name"): p.get("pid") for p in active_procs}
 
@@ -1053,7 +1062,7 @@ def _cleanup_all_processes():
     print("🛑 正在停止所有扫描进程（保留agent配置）...")
     
     # 先同步agents.json中的进程到队列（确保队列完整）
-    _sync_processes_to_queue()
+    _sync_processes_to_queue(workers)
     
     # 遍历所有进程队列中的进程（包括已崩溃的）
     # 使用 list() 创建副本，避免在遍历时修改队列
@@ -13,6 +13,7 @@ PROMPTS_DIR (提示词模板):
   固定指向包内的 prompts/ 目录，随包分发。
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -53,19 +54,23 @@ WORKSPACE = _resolve_workspace()
 
 # BASE_DIR 统一为 WORKSPACE/Kai
 BASE_DIR = WORKSPACE / "Kai"
-
-# 自定义目录（用于用户贡献的 agent 类型和提示词）
-CUSTOM_AGENTS_DIR = BASE_DIR / "custom_agents"  # 自定义 agent 类型目录
-CUSTOM_PROMPTS_DIR = BASE_DIR / "custom_prompts"  # 自定义提示词模板目录
+BASE_DIR_STR = str(BASE_DIR)  # 预先字符串化，供 subprocess cwd 等热路径直接使用
 
 # ============ 系统目录 ============
 
 DEFAULT_WORKER_NAME = "sen"  # 默认 agent 名称（保持向后兼容）
 
-AGENTS_DIR = BASE_DIR / "agents"
-SKILLS_DIR = BASE_DIR / "skills"
-TESTCASES_DIR = BASE_DIR / "testcases"
-AGENTS_FILE = AGENTS_DIR / "agents.json"
+# 由 BASE_DIR 派生的路径：首次访问 cfg.XXX 时才构造（见模块级 __getattr__），
+# 结果缓存在 _path_cache 中，apply_workspace 切换工作区时只需清空缓存
+_PATH_MAP = {
+    "CUSTOM_AGENTS_DIR": "custom_agents",    # 自定义 agent 类型目录
+    "CUSTOM_PROMPTS_DIR": "custom_prompts",  # 自定义提示词模板目录
+    "AGENTS_DIR": "agents",
+    "SKILLS_DIR": "skills",
+    "TESTCASES_DIR": "testcases",
+    "AGENTS_FILE": "agents/agents.json",
+}
+_path_cache: dict[str, Path] = {}
 
 # ============ Agent 配置 ============
 # 直接使用 agent 命令
@@ -81,19 +86,48 @@ if sys.platform == "win32":
 else:
     CURSOR_BIN = "agent"
     CURSOR_BIN_IS_PS = False
-# 模型设置：优先使用环境变量，然后是配置文件，最后是默认值
-from secretary.settings import get_model
-DEFAULT_MODEL = os.environ.get("CURSOR_MODEL") or get_model() or "Auto"  # "Auto" = 自动选择模型
-
-# ============ 扫描器配置 ============
-SCAN_INTERVAL = int(os.environ.get("SCAN_INTERVAL", "5"))       # 扫描tasks/间隔(秒)
-WORKER_RETRY_INTERVAL = int(os.environ.get("RETRY_INTERVAL", "3"))  # worker重试间隔(秒)
-DEFAULT_MIN_TIME = int(os.environ.get("MIN_TIME", "0"))          # 默认最低执行时间(秒), 0=不限制
+# 模型设置 DEFAULT_MODEL：优先使用环境变量，然后是配置文件，最后是默认值 "Auto"（自动选择模型）
+# 访问 cfg.DEFAULT_MODEL 时才求值（见模块级 __getattr__），import 本模块不读配置文件
+
+# ============ 扫描器 / 回收者配置 ============
+# 以下整数配置来自环境变量: 属性名 -> (环境变量名, 默认值)
+# 首次访问任一项时一次性解析 (_env_snapshot)，之后直接查表
+_ENV_INTS = {
+    "SCAN_INTERVAL": ("SCAN_INTERVAL", "5"),              # 扫描tasks/间隔(秒)
+    "WORKER_RETRY_INTERVAL": ("RETRY_INTERVAL", "3"),     # worker重试间隔(秒)
+    "DEFAULT_MIN_TIME": ("MIN_TIME", "0"),                # 默认最低执行时间(秒), 0=不限制
+    "RECYCLER_INTERVAL": ("RECYCLER_INTERVAL", "120"),    # 回收者扫描间隔(秒) = 2分钟
+    "RECYCLER_CONCURRENCY": ("RECYCLER_CONCURRENCY", "1"),  # 回收者同时审查的报告数
+}
 # 仅以下类型的任务会被 scanner 执行；monitor 等其它类型不进入执行流程
-EXECUTABLE_TASK_TYPES = ("task", "hire", "recycle")
+EXECUTABLE_TASK_TYPES = frozenset({"task", "hire", "recycle"})
+
+
+@lru_cache(maxsize=1)
+def _env_snapshot() -> dict[str, int]:
+    """一次性读取并解析 _ENV_INTS 中的环境变量"""
+    return {attr: int(os.environ.get(env, default)) for attr, (env, default) in _ENV_INTS.items()}
+
+
+# ============ 延迟求值的模块属性 ============
 
-# ============ 回收者配置 ============
-RECYCLER_INTERVAL = int(os.environ.get("RECYCLER_INTERVAL", "120"))  # 回收者扫描间隔(秒) = 2分钟
+def _path(name: str) -> Path:
+    """_PATH_MAP 中的运行时路径（BASE_DIR 下），结果缓存在 _path_cache"""
+    path = _path_cache.get(name)
+    if path is None:
+        path = _path_cache[name] = BASE_DIR / _PATH_MAP[name]
+    return path
+
+
+def __getattr__(name: str):
+    if name in _PATH_MAP:
+        return _path(name)
+    if name in _ENV_INTS:
+        return _env_snapshot()[name]
+    if name == "DEFAULT_MODEL":
+        from secretary.settings import get_model
+        return os.environ.get("CURSOR_MODEL") or get_model() or "Auto"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ============ 执行方式与日志 ============
 # 前台执行：task, keep（仅 spawn 子进程后立即返回）, hire, fire, workers, monitor, report, base, name, model, target, help, check（tail -f）, stop, clean-*, skills, learn, forget, use
@@ -140,23 +174,30 @@ def apply_workspace(ws: Path):
     ws_resolved = ws.resolve()
     _self.WORKSPACE = ws_resolved
     _self.BASE_DIR = ws_resolved / "Kai"
-    _self.CUSTOM_AGENTS_DIR = _self.BASE_DIR / "custom_agents"
-    _self.CUSTOM_PROMPTS_DIR = _self.BASE_DIR / "custom_prompts"
-    _self.AGENTS_DIR = _self.BASE_DIR / "agents"
-    _self.SKILLS_DIR = _self.BASE_DIR / "skills"
-    _self.TESTCASES_DIR = _self.BASE_DIR / "testcases"
-    _self.AGENTS_FILE = _self.AGENTS_DIR / "agents.json"
+    _self.BASE_DIR_STR = str(_self.BASE_DIR)
+    _path_cache.clear()
+    from secretary.fs_utils import invalidate_dir_cache
+    from secretary.settings import invalidate_settings_cache
+    invalidate_dir_cache()
+    invalidate_settings_cache()
+
+
+def _ensure_dir(d: Path):
+    """目录已存在时只做一次 isdir 检查，不再发起必然 EEXIST 的 mkdir"""
+    if not os.path.isdir(d):
+        d.mkdir(parents=True, exist_ok=True)
 
 
 def ensure_dirs():
     """确保所有运行时目录存在"""
-    for d in [TESTCASES_DIR, SKILLS_DIR, AGENTS_DIR]:
-        d.mkdir(parents=True, exist_ok=True)
+    agents_dir = _path("AGENTS_DIR")
+    for d in [_path("TESTCASES_DIR"), _path("SKILLS_DIR"), agents_dir]:
+        _ensure_dir(d)
     try:
         from secretary.agents import list_workers
         for worker in list_workers():
-            agent_dir = AGENTS_DIR / worker.get("name", "")
+            agent_dir = agents_dir / worker.get("name", "")
             for sub in ("tasks", "ongoing", "reports", "logs", "stats"):
-                (agent_dir / sub).mkdir(parents=True, exist_ok=True)
+                _ensure_dir(agent_dir / sub)
     except Exception:
         pass
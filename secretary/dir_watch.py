@@ -0,0 +1,108 @@
+"""
+目录变更等待 — 扫描循环休眠期间，有新任务写入/移入时提前唤醒
+
+Linux 下通过 ctypes 直接调用 inotify（不引入额外依赖），监听 IN_CLOSE_WRITE / IN_MOVED_TO：
+文件写完或被移入监视目录时，wait() 立即返回，无需等满 SCAN_INTERVAL。
+其它平台或 inotify 不可用时退化为 time.sleep，行为与原先的固定间隔轮询一致。
+
+wait() 最多阻塞 timeout 秒，超时后照常返回，扫描循环的周期性检查仍作为兜底。
+被监视的目录删除/重建后内核会撤销该 watch (IN_IGNORED)，此时 watcher 关闭并退化为 time.sleep，
+active 变为 False，调用方可据此恢复常规轮询间隔。
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_IGNORED = 0x00008000
+
+# struct inotify_event 的定长头部: wd, mask, cookie, len（其后是 len 字节的文件名）
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    """加载带 inotify 接口的 libc，不可用时返回 None"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_add_watch.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class DirWatcher:
+    """在若干目录上等待新文件；不支持 inotify 时 wait() 等价于 time.sleep"""
+
+    def __init__(self, dirs: list[Path]):
+        self._fd: int | None = None
+        libc = _load_libc()
+        if libc is None or not dirs:
+            return
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO
+        watched = sum(1 for d in dirs if libc.inotify_add_watch(fd, os.fsencode(d), mask) >= 0)
+        if not watched:
+            os.close(fd)
+            return
+        self._fd = fd
+
+    @property
+    def active(self) -> bool:
+        """是否真正在使用 inotify"""
+        return self._fd is not None
+
+    def wait(self, timeout: float):
+        """阻塞至监视目录出现新文件或超时"""
+        if self._fd is None:
+            time.sleep(timeout)
+            return
+        try:
+            ready = select.select([self._fd], [], [], timeout)[0]
+        except (OSError, ValueError):
+            time.sleep(timeout)
+            return
+        if ready:
+            self._drain()
+
+    def _drain(self):
+        """读空已到达的事件；一批事件只需唤醒一次，由 trigger 重新扫描目录
+
+        只检查事件头部的 IN_IGNORED：任一 watch 失效即关闭 watcher，回到按间隔轮询。
+        """
+        lost = False
+        try:
+            while True:
+                buf = os.read(self._fd, 4096)
+                if not buf:
+                    break
+                offset = 0
+                while offset + _EVENT_HEADER.size <= len(buf):
+                    _, mask, _, name_len = _EVENT_HEADER.unpack_from(buf, offset)
+                    if mask & _IN_IGNORED:
+                        lost = True
+                    offset += _EVENT_HEADER.size + name_len
+        except OSError:
+            pass  # EAGAIN: 已读空
+        if lost:
+            self.close()
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
@@ -0,0 +1,197 @@
+"""
+文件系统辅助 — 基于 os.scandir 的目录统计
+
+dashboard / agents 等模块需要频繁统计目录下某类文件的数量（如 *.md、*-report.md）。
+Path.glob 会为每个条目构造 Path 对象并做 fnmatch 匹配，这里统一改为 os.scandir +
+后缀比较，目录不存在时视为 0。
+
+cached_count_files 额外以目录自身的 st_mtime_ns 作为缓存键：目录中增删/重命名条目
+会更新目录 mtime，未变化时直接返回上次结果，只需一次 stat。
+"""
+import heapq
+import os
+import time
+from pathlib import Path
+
+# 目录计数缓存: (目录, 后缀) -> (目录 st_mtime_ns, 计数)
+_DIR_CACHE: dict[tuple[str, str], tuple[int, int]] = {}
+
+# 目录列表缓存: (目录, 后缀) -> (目录 st_mtime_ns, 按 mtime 升序的 (mtime, 文件) 列表)
+_LIST_CACHE: dict[tuple[str, str], tuple[int, list[tuple[float, Path]]]] = {}
+
+# 不存在的目录: (目录, 后缀) -> 下次允许重新探测的 time.monotonic() 时刻
+_MISSING_UNTIL: dict[tuple[str, str], float] = {}
+
+# mtime 距今不足该时长的目录不写入缓存：在时间戳粒度较粗的文件系统上，
+# 同一时间片内的后续增删不会改变 mtime，缓存可能因此过期
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def is_racy(mtime_ns: int) -> bool:
+    """mtime 是否仍在不可信窗口内：此时不应以 mtime 为键缓存结果（同一时间片内的后续改动可能不改变 mtime）"""
+    return time.time_ns() - mtime_ns <= _RACY_WINDOW_NS
+
+
+def count_files(directory: Path | str, suffix: str) -> int:
+    """统计目录下文件名以 suffix 结尾的文件数（目录不存在时返回 0）
+
+    以 bytes 路径调用 scandir，条目名保持为 bytes，后缀比较无需逐条解码文件名。
+    """
+    try:
+        it = os.scandir(os.fsencode(directory))
+    except (FileNotFoundError, NotADirectoryError):
+        return 0
+    count = 0
+    suffix_b = os.fsencode(suffix)
+    endswith = bytes.endswith  # 热循环内避免逐条目的属性查找
+    with it:
+        for entry in it:
+            if endswith(entry.name, suffix_b) and entry.is_file(follow_symlinks=False):
+                count += 1
+    return count
+
+
+def has_files(directory: Path, suffix: str) -> bool:
+    """目录下是否存在以 suffix 结尾的文件（找到第一个即返回，目录不存在时为 False）"""
+    try:
+        it = os.scandir(directory)
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+    endswith = str.endswith
+    with it:
+        for entry in it:
+            if endswith(entry.name, suffix) and entry.is_file(follow_symlinks=False):
+                return True
+    return False
+
+
+def list_files(directory: Path, suffix: str) -> list[Path]:
+    """列出目录下以 suffix 结尾的文件（scandir 顺序，目录不存在时返回空列表）"""
+    try:
+        it = os.scandir(directory)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    endswith = str.endswith
+    with it:
+        return [directory / entry.name for entry in it
+                if endswith(entry.name, suffix) and entry.is_file(follow_symlinks=False)]
+
+
+def _mtime_entries(directory: Path, suffix: str) -> list[tuple[float, str]]:
+    """列出目录下以 suffix 结尾的文件 (mtime, 文件名)，每个条目只 stat 一次"""
+    try:
+        it = os.scandir(directory)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    entries = []
+    append = entries.append
+    endswith = str.endswith
+    with it:
+        for entry in it:
+            name = entry.name
+            if not endswith(name, suffix):
+                continue
+            try:
+                if entry.is_file(follow_symlinks=False):
+                    append((entry.stat().st_mtime, name))
+            except OSError:
+                continue  # 扫描期间被移走
+    return entries
+
+
+def newest_files(directory: Path, suffix: str, limit: int | None = None) -> list[Path]:
+    """按 mtime 从新到旧返回文件；指定 limit 时只取前 limit 个 (heapq.nlargest，无需全量排序)"""
+    entries = _mtime_entries(directory, suffix)
+    if limit is None:
+        entries.sort(reverse=True)
+    else:
+        entries = heapq.nlargest(limit, entries)
+    return [directory / name for _, name in entries]
+
+
+def files_by_mtime(directory: Path, suffix: str) -> list[tuple[float, Path]]:
+    """按 mtime 从旧到新返回 (mtime, 文件) 列表，供调用方按序挑选第一个符合条件的文件"""
+    entries = _mtime_entries(directory, suffix)
+    entries.sort()
+    return [(mtime, directory / name) for mtime, name in entries]
+
+
+def latest_mtime(directory: Path, suffix: str) -> float:
+    """目录下以 suffix 结尾的文件中最新的 mtime（没有文件时返回 0.0）"""
+    return max((m for m, _ in _mtime_entries(directory, suffix)), default=0.0)
+
+
+def publish_file(path: Path, content: str) -> None:
+    """原子地发布文本文件：先写入同目录的 <name>.tmp，再 rename 到目标名
+
+    扫描器只匹配 .md 等后缀，.tmp 文件不会被当作任务；rename 之后读到的一定是完整内容，
+    不会在写入中途被 trigger 取走并读到半截文件。
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(content, encoding="utf-8")
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def cached_count_files(directory: Path | str, suffix: str, missing_ttl: float = 0.0) -> int:
+    """同 count_files，但目录 mtime 未变化时直接返回缓存的计数
+
+    missing_ttl > 0 时，目录不存在的结果会被记住 missing_ttl 秒，期间不再 stat；
+    适合 dashboard 这类可以容忍短暂滞后、且工作区中常有可选目录缺失的场景。
+    """
+    key = (os.fspath(directory), suffix)
+    if missing_ttl > 0:
+        until = _MISSING_UNTIL.get(key)
+        if until is not None:
+            if time.monotonic() < until:
+                return 0
+            del _MISSING_UNTIL[key]
+    try:
+        mtime_ns = os.stat(key[0]).st_mtime_ns
+    except OSError:
+        _DIR_CACHE.pop(key, None)
+        if missing_ttl > 0:
+            _MISSING_UNTIL[key] = time.monotonic() + missing_ttl
+        return 0
+    hit = _DIR_CACHE.get(key)
+    if hit is not None and hit[0] == mtime_ns:
+        return hit[1]
+    count = count_files(directory, suffix)
+    if not is_racy(mtime_ns):
+        _DIR_CACHE[key] = (mtime_ns, count)
+    return count
+
+
+def cached_files_by_mtime(directory: Path, suffix: str) -> list[tuple[float, Path]]:
+    """同 files_by_mtime，但目录 mtime 未变化（没有文件移入/移出）时直接复用上次的列表
+
+    返回的列表可能被缓存，调用方不应原地修改。
+    """
+    key = (os.fspath(directory), suffix)
+    try:
+        mtime_ns = os.stat(key[0]).st_mtime_ns
+    except OSError:
+        _LIST_CACHE.pop(key, None)
+        return []
+    hit = _LIST_CACHE.get(key)
+    if hit is not None and hit[0] == mtime_ns:
+        return hit[1]
+    entries = files_by_mtime(directory, suffix)
+    if not is_racy(mtime_ns):
+        _LIST_CACHE[key] = (mtime_ns, entries)
+    return entries
+
+
+def count_many(directories: list[Path], suffix: str, missing_ttl: float = 0.0) -> list[int]:
+    """批量统计多个目录（顺序与 directories 一致），每个目录各走一次 cached_count_files"""
+    return [cached_count_files(d, suffix, missing_ttl) for d in directories]
+
+
+def invalidate_dir_cache():
+    """清空目录计数与列表缓存（切换工作区时调用）"""
+    _DIR_CACHE.clear()
+    _LIST_CACHE.clear()
+    _MISSING_UNTIL.clear()
@@ -5,29 +5,47 @@
 """
 import json
 import re
-from typing import Optional
+from typing import Iterable, Optional
+
+# 逐事件解码是格式化的热点：装有 orjson 时优先使用（可选依赖，未安装时退回标准库）。
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，下方的异常处理无需区分
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+_SEP = "=" * 60
+
+# tool_call 事件中的工具键 -> (图标, 展示的参数名)；模块级常量，避免每次调用重建
+_TOOL_ICONS = {
+    "shellToolCall":      ("🔧", "command"),
+    "editToolCall":       ("✏️ ", "filePath"),
+    "writeToolCall":      ("📝", "filePath"),
+    "createFileToolCall": ("📝", "filePath"),
+    "readFileToolCall":   ("📖", "filePath"),
+    "grepToolCall":       ("🔍", "pattern"),
+    "globToolCall":       ("📂", "pattern"),
+    "listDirToolCall":    ("📂", "dirPath"),
+}
 
 
 def format_stream_json_to_conversation(raw_json: str) -> str:
     """将流式 JSON 输出转换为可读的对话格式"""
     if not raw_json or not raw_json.strip():
         return ""
+    return format_stream_json_lines(raw_json.splitlines())
 
+
+def format_stream_json_lines(raw_lines: Iterable[str]) -> str:
+    """同 format_stream_json_to_conversation，但直接消费逐行的可迭代对象（列表、打开的文件等）
+
+    调用方手上已有按行收集的输出或日志文件时，无需先拼成整串再拆分。
+    """
     lines: list[str] = []
     assistant_parts: list[str] = []
     tool_calls: list[str] = []
 
-    _TOOL_ICONS = {
-        "shellToolCall":      ("🔧", "command"),
-        "editToolCall":       ("✏️ ", "filePath"),
-        "writeToolCall":      ("📝", "filePath"),
-        "createFileToolCall": ("📝", "filePath"),
-        "readFileToolCall":   ("📖", "filePath"),
-        "grepToolCall":       ("🔍", "pattern"),
-        "globToolCall":       ("📂", "pattern"),
-        "listDirToolCall":    ("📂", "dirPath"),
-    }
-
     def _flush_tools():
         if not tool_calls:
             return
@@ -46,14 +64,19 @@ def format_stream_json_to_conversation(raw_json: str) -> str:
             lines.append(f"\n💬 回复:\n{text}\n")
         assistant_parts.clear()
 
-    for raw_line in raw_json.splitlines():
+    for raw_line in raw_lines:
         raw_line = raw_line.strip()
         if not raw_line:
             continue
 
-        try:
-            evt = json.loads(raw_line)
-        except json.JSONDecodeError:
+        # 事件总是 JSON 对象：非 "{" 开头的行直接按文本处理，不经过解码与异常
+        evt = None
+        if raw_line.startswith("{"):
+            try:
+                evt = _json_loads(raw_line)
+            except json.JSONDecodeError:
+                pass
+        if not isinstance(evt, dict):
             if "Error:" in raw_line:
                 lines.append(f"  ❌ {raw_line}")
             elif not raw_line.startswith("Warning:"):
@@ -76,19 +99,22 @@ def format_stream_json_to_conversation(raw_json: str) -> str:
 
         elif evt_type == "assistant":
             content = evt.get("message", {}).get("content", [])
-            text = "".join(c.get("text", "") for c in content if c.get("type") == "text").strip()
+            texts = [c.get("text", "") for c in content if c.get("type") == "text"]
+            # 常见情况只有一个文本段：直接使用，省去 join 的整段拷贝（strip 在无需裁剪时也不拷贝）
+            text = (texts[0] if len(texts) == 1 else "".join(texts)).strip()
             if text:
                 assistant_parts.append(text)
 
         elif evt_type == "tool_call" and subtype == "started":
             tc = evt.get("tool_call", {})
-            for key, (icon, arg_name) in _TOOL_ICONS.items():
-                if key in tc:
-                    val = tc[key].get("args", {}).get(arg_name, "")
-                    if val:
-                        display = val if len(val) <= 80 else val[:77] + "…"
-                        tool_calls.append(f"{icon} {display}")
-                    break
+            # 每个 tool_call 只含一个工具键：遍历事件自身的键做字典查找，而不是逐个试探工具表
+            key = next((k for k in tc if k in _TOOL_ICONS), None)
+            if key is not None:
+                icon, arg_name = _TOOL_ICONS[key]
+                val = tc[key].get("args", {}).get(arg_name, "")
+                if val:
+                    display = val if len(val) <= 80 else val[:77] + "…"
+                    tool_calls.append(f"{icon} {display}")
 
         elif evt_type == "result":
             _flush_assistant()
@@ -124,9 +150,9 @@ def format_conversation_log(conversation_log: list[dict]) -> str:
         raw_json = entry.get("raw_stream_json", "")
         
         # 格式化这一轮的对话
-        formatted_lines.append(f"\n{'='*60}")
+        formatted_lines.append(f"\n{_SEP}")
         formatted_lines.append(f"第 {round_num} 轮 - {timestamp}")
-        formatted_lines.append(f"{'='*60}\n")
+        formatted_lines.append(f"{_SEP}\n")
         
         # 如果有可读输出，先显示
         readable = entry.get("readable_output", "")
@@ -28,40 +28,59 @@
 4. 根据终止条件判断是否继续（单次执行 vs 直到文件删除）
 5. 完成后写入统计
 """
+import builtins
+import functools
+import heapq
 import json
 import os
-import shutil
 import sys
 import time
 import traceback
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, field
+from typing import BinaryIO, Iterable
 
 import re
 
 import secretary.config as cfg
 from secretary.config import EXECUTABLE_TASK_TYPES
+from secretary.fs_utils import count_files, files_by_mtime, has_files, list_files, newest_files
+from secretary.dir_watch import DirWatcher
 from secretary.agent_config import AgentConfig, TerminationCondition, TriggerCondition, TriggerConfig
 from secretary.agent_types.worker import run_worker_first_round, run_worker_continue, run_worker_refine
 from secretary.agent_runner import RoundStats
 from secretary.agent_loop import run_loop, load_prompt
 from secretary.agent_types.secretary import run_secretary
 
-# 确保输出实时刷新（用于后台运行时日志及时写入）
-# 创建一个带自动刷新的 print 函数
-_original_print = print
-
+# 统计 JSON 含完整对话日志，可达数 MB：装有 orjson 时用它序列化（可选依赖，未安装时退回标准库）
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def print(*args, **kwargs):
-    """重写 print 函数，默认 flush=True 确保实时输出"""
-    if 'flush' not in kwargs:
-        kwargs['flush'] = True
-    _original_print(*args, **kwargs)
+# 确保输出实时刷新（用于后台运行时日志及时写入）
+# 模块内的 print 预绑定 flush=True（functools.partial 在 C 层合并参数，每次调用无额外 Python 包装）
+print = functools.partial(builtins.print, flush=True)
 
 # 当前 scanner 进程 ID
 _PID = os.getpid()
 
+# 任务被消费后可不经休眠连续处理的最大轮数（排空积压队列，之后照常休眠一次）
+_MAX_BATCH = 64
+
+# inotify 可用时，空闲期间的兜底重扫间隔（秒）：新任务由 DirWatcher 即时唤醒，无需按 SCAN_INTERVAL 轮询
+_IDLE_RESCAN_SEC = 60
+
+# 任务元数据标注，直接匹配从磁盘读出的字节，无需先解码
+# execution_scope 约定写在任务文件开头，只需读取文件头部即可判定；min_time 由提交方追加在文件末尾
+_SCOPE_RE = re.compile(rb"<!--\s*execution_scope:\s*(\w+)\s*-->")
+_SCOPE_HEAD_BYTES = 4096
+_MIN_TIME_RE = re.compile(rb"<!--\s*min_time:\s*(\d+)\s*-->")
+
+# 任务文件 -> ((st_mtime_ns, st_size), scope)；文件未变化时无需再次读取
+_SCOPE_CACHE: dict[Path, tuple[tuple[int, int], str]] = {}
+
 
 # ============================================================
 #  文件锁 — 多进程互斥
@@ -93,9 +112,12 @@ class TaskStats:
     min_time: int = 0                   # 最低执行时间(秒), 0=不限制
     last_response: str = ""             # 最后一轮 Agent 的回复文本
     round_details: list[dict] = field(default_factory=list)
-    conversation_log: list[dict] = field(default_factory=list)  # 完整对话日志 (每轮的原始输出)
+    conversation_log: list[dict] = field(default_factory=list)  # 对话日志 (写入 jsonl 时只保留每轮摘要)
+    conversation_file: str = ""         # 完整对话日志文件名 ({task_name}-conversation.jsonl)
     worker_pid: int = 0                 # 执行本任务的 scanner PID
     _wall_start: float = 0.0           # 内部: 墙钟起点
+    _files_seen: set[str] = field(default_factory=set, repr=False)  # 内部: all_files_changed 去重用
+    _conversation_fh: BinaryIO | None = field(default=None, repr=False)  # 内部: 对话日志文件
 
     def mark_start(self):
         """记录墙钟开始"""
@@ -108,6 +130,25 @@ class TaskStats:
         self.end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         if self._wall_start > 0:
             self.wall_clock_ms = int((time.time() - self._wall_start) * 1000)
+        self.close_conversation_log()
+
+    def open_conversation_log(self, stats_dir: Path):
+        """打开 {task_name}-conversation.jsonl，之后每轮对话写入一行，不再全部留在内存中"""
+        path = stats_dir / f"{self.task_name}-conversation.jsonl"
+        try:
+            stats_dir.mkdir(parents=True, exist_ok=True)
+            self._conversation_fh = path.open("wb")
+        except OSError:
+            return  # 打不开时退回到内存中保存完整对话
+        self.conversation_file = path.name
+
+    def close_conversation_log(self):
+        if self._conversation_fh is not None:
+            try:
+                self._conversation_fh.close()
+            except OSError:
+                pass  # 关闭时冲刷缓冲失败（如磁盘已满）不影响任务
+            self._conversation_fh = None
 
     def add_round(self, round_num: int, stats: RoundStats, success: bool,
                   raw_output: str = "", readable_output: str = ""):
@@ -118,9 +159,11 @@ class TaskStats:
         self.total_tool_calls += stats.tool_call_count
 
         for f in stats.files_changed:
-            if f not in self.all_files_changed:
+            if f not in self._files_seen:
+                self._files_seen.add(f)
                 self.all_files_changed.append(f)
 
+        # shell 命令按执行记录保留，重复命令不去重
         self.all_shell_commands.extend(stats.shell_commands)
 
         if stats.session_id:
@@ -146,18 +189,64 @@ class TaskStats:
             "last_response": last_text,
         })
 
-        # 保存对话日志
-        self.conversation_log.append({
+        # 保存对话日志：有对话日志文件时整轮输出追加写入文件，内存中只留摘要
+        entry = {
             "round": round_num,
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "readable_output": readable_output,
             "raw_stream_json": raw_output,
-        })
+        }
+        if self._conversation_fh is not None:
+            try:
+                self._conversation_fh.write(_dump_json_line(entry))
+                self._conversation_fh.flush()
+            except OSError:
+                # 对话日志仅用于诊断：写入失败（磁盘满、stats 目录被删等）时放弃文件，本轮起保留在内存中
+                self.close_conversation_log()
+            else:
+                entry = {
+                    "round": round_num,
+                    "timestamp": entry["timestamp"],
+                    "readable_output_chars": len(readable_output),
+                    "raw_stream_json_chars": len(raw_output),
+                }
+        self.conversation_log.append(entry)
 
     @property
     def total_duration_sec(self) -> float:
         return self.total_duration_ms / 1000.0
 
+    def to_json_dict(self) -> dict:
+        """-stats.json 的内容：数字统计在前、每轮详情其次、对话日志在最后（不含内部字段）"""
+        return {
+            # ---- 数字化统计 (顶部) ----
+            "task_name": self.task_name,
+            "success": self.success,
+            "total_rounds": self.total_rounds,
+            "wall_clock_ms": self.wall_clock_ms,
+            "wall_clock_sec": round(self.wall_clock_sec, 1),
+            "total_duration_ms": self.total_duration_ms,
+            "total_duration_sec": round(self.total_duration_sec, 1),
+            "total_api_duration_ms": self.total_api_duration_ms,
+            "total_tool_calls": self.total_tool_calls,
+            "files_changed_count": len(self.all_files_changed),
+            "files_changed": self.all_files_changed,
+            "shell_commands_count": len(self.all_shell_commands),
+            "shell_commands": self.all_shell_commands,
+            "model": self.model,
+            "session_id": self.session_id,
+            "worker_pid": self.worker_pid,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "min_time": self.min_time,
+            "last_response": self.last_response,
+            # ---- 每轮统计详情 ----
+            "round_details": self.round_details,
+            # ---- 对话日志 (最底部, 方便 debug；完整内容见 conversation_file) ----
+            "conversation_file": self.conversation_file,
+            "conversation_log": self.conversation_log,
+        }
+
     @property
     def wall_clock_sec(self) -> float:
         return self.wall_clock_ms / 1000.0
@@ -167,38 +256,73 @@ class TaskStats:
 #  统计报告
 # ============================================================
 
+def _dump_json_line(data: dict) -> bytes:
+    """序列化为单行 JSON（jsonl 的一行，含换行符）"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _dump_stats_json(data: dict) -> bytes:
+    """序列化统计 JSON（缩进 2，保留非 ASCII 字符）为 UTF-8 字节"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+# Markdown 统计报告的汇总表（模块加载时拼好，写报告时只做一次 format_map）
+_STATS_MD_HEADER = "\n".join([
+    "# 📊 调用统计: {task_name}\n",
+    "",
+    "| 项目 | 数据 |",
+    "|------|------|",
+    "| 状态 | {status} |",
+    "| 总对话轮数 | {total_rounds} 轮 |",
+    "| 墙钟总用时 | {wall_clock_sec:.1f}s ({wall_clock_ms}ms) |",
+    "| Agent 累计用时 | {total_duration_sec:.1f}s ({total_duration_ms}ms) |",
+    "| API 累计用时 | {total_api_duration_ms}ms |",
+    "| Tool Calls 总数 | {total_tool_calls} 次 |",
+    "| 涉及文件数 | {files_count} 个 |",
+    "| Shell 命令数 | {commands_count} 条 |",
+    "| 模型 | {model} |",
+    "| Session ID | `{session_id}` |",
+    "| Worker PID | {worker_pid} |",
+    "| 开始时间 | {start_time} |",
+    "| 结束时间 | {end_time} |",
+])
+
 def _write_scanner_report(task_stats: TaskStats, stats_dir: Path):
     """
     将 scanner 的调用统计写入 stats/ 文件夹
 
     生成两个文件:
       - {task_name}-stats.md  — 可读的 Markdown 统计报告
-      - {task_name}-stats.json — 结构化数据 (数字统计 + 完整对话日志)
+      - {task_name}-stats.json — 结构化数据 (数字统计 + 对话日志；
+        完整对话已逐轮写入 {task_name}-conversation.jsonl 时只含每轮摘要)
     """
     stats_dir.mkdir(parents=True, exist_ok=True)
     
     # ---- Markdown 统计报告 ----
     md_path = stats_dir / f"{task_stats.task_name}-stats.md"
 
-    lines = [
-        f"# 📊 调用统计: {task_stats.task_name}\n",
-        f"",
-        f"| 项目 | 数据 |",
-        f"|------|------|",
-        f"| 状态 | {'✅ 完成' if task_stats.success else '❌ 失败'} |",
-        f"| 总对话轮数 | {task_stats.total_rounds} 轮 |",
-        f"| 墙钟总用时 | {task_stats.wall_clock_sec:.1f}s ({task_stats.wall_clock_ms}ms) |",
-        f"| Agent 累计用时 | {task_stats.total_duration_sec:.1f}s ({task_stats.total_duration_ms}ms) |",
-        f"| API 累计用时 | {task_stats.total_api_duration_ms}ms |",
-        f"| Tool Calls 总数 | {task_stats.total_tool_calls} 次 |",
-        f"| 涉及文件数 | {len(task_stats.all_files_changed)} 个 |",
-        f"| Shell 命令数 | {len(task_stats.all_shell_commands)} 条 |",
-        f"| 模型 | {task_stats.model or 'Auto'} |",
-        f"| Session ID | `{task_stats.session_id}` |",
-        f"| Worker PID | {task_stats.worker_pid} |",
-        f"| 开始时间 | {task_stats.start_time} |",
-        f"| 结束时间 | {task_stats.end_time} |",
-    ]
+    lines = [_STATS_MD_HEADER.format_map({
+        "task_name": task_stats.task_name,
+        "status": "✅ 完成" if task_stats.success else "❌ 失败",
+        "total_rounds": task_stats.total_rounds,
+        "wall_clock_sec": task_stats.wall_clock_sec,
+        "wall_clock_ms": task_stats.wall_clock_ms,
+        "total_duration_sec": task_stats.total_duration_sec,
+        "total_duration_ms": task_stats.total_duration_ms,
+        "total_api_duration_ms": task_stats.total_api_duration_ms,
+        "total_tool_calls": task_stats.total_tool_calls,
+        "files_count": len(task_stats.all_files_changed),
+        "commands_count": len(task_stats.all_shell_commands),
+        "model": task_stats.model or "Auto",
+        "session_id": task_stats.session_id,
+        "worker_pid": task_stats.worker_pid,
+        "start_time": task_stats.start_time,
+        "end_time": task_stats.end_time,
+    })]
     if task_stats.min_time > 0:
         lines.append(f"| 最低执行时间 | {task_stats.min_time}s |")
     lines.append("")
@@ -215,15 +339,13 @@ def _write_scanner_report(task_stats: TaskStats, stats_dir: Path):
     # 涉及的文件
     if task_stats.all_files_changed:
         lines.append("## 涉及的文件\n")
-        for f in task_stats.all_files_changed:
-            lines.append(f"- `{f}`")
+        lines.extend(f"- `{f}`" for f in task_stats.all_files_changed)
         lines.append("")
 
     # Shell 命令
     if task_stats.all_shell_commands:
         lines.append("## 执行的 Shell 命令\n")
-        for cmd in task_stats.all_shell_commands:
-            lines.append(f"- `{cmd}`")
+        lines.extend(f"- `{cmd}`" for cmd in task_stats.all_shell_commands)
         lines.append("")
 
     # 每轮详情
@@ -250,36 +372,9 @@ def _write_scanner_report(task_stats: TaskStats, stats_dir: Path):
 
     md_path.write_text("\n".join(lines), encoding="utf-8")
 
-    # ---- JSON 统计 + 完整对话日志 ----
+    # ---- JSON 统计 + 对话日志 ----
     json_path = stats_dir / f"{task_stats.task_name}-stats.json"
-    json_data = {
-        # ---- 数字化统计 (顶部) ----
-        "task_name": task_stats.task_name,
-        "success": task_stats.success,
-        "total_rounds": task_stats.total_rounds,
-        "wall_clock_ms": task_stats.wall_clock_ms,
-        "wall_clock_sec": round(task_stats.wall_clock_sec, 1),
-        "total_duration_ms": task_stats.total_duration_ms,
-        "total_duration_sec": round(task_stats.total_duration_sec, 1),
-        "total_api_duration_ms": task_stats.total_api_duration_ms,
-        "total_tool_calls": task_stats.total_tool_calls,
-        "files_changed_count": len(task_stats.all_files_changed),
-        "files_changed": task_stats.all_files_changed,
-        "shell_commands_count": len(task_stats.all_shell_commands),
-        "shell_commands": task_stats.all_shell_commands,
-        "model": task_stats.model,
-        "session_id": task_stats.session_id,
-        "worker_pid": task_stats.worker_pid,
-        "start_time": task_stats.start_time,
-        "end_time": task_stats.end_time,
-        "min_time": task_stats.min_time,
-        "last_response": task_stats.last_response,
-        # ---- 每轮统计详情 ----
-        "round_details": task_stats.round_details,
-        # ---- 完整对话日志 (最底部, 方便 debug) ----
-        "conversation_log": task_stats.conversation_log,
-    }
-    json_path.write_text(json.dumps(json_data, ensure_ascii=False, indent=2), encoding="utf-8")
+    json_path.write_bytes(_dump_stats_json(task_stats.to_json_dict()))
     print(f"   📊 统计已写入 stats/: {md_path.name} + {json_path.name}")
 
 
@@ -292,12 +387,24 @@ def _get_task_execution_scope(task_file: Path) -> str:
     从任务文件中解析 execution_scope，用于判断是否需被 scanner 执行。
     约定: 文件内容中的 <!-- execution_scope: X -->，X 为 task/hire/recycle/monitor 等。
     若未标注，默认为 "task"（保持与旧任务兼容，会被执行）。
+    标注通常写在开头，先只读前 4KB；头部没有且文件更长时再读取其余内容，结果与全文匹配一致。
+    按 (mtime, size) 缓存结果，未变化的文件不再重复读取。
     """
     try:
-        content = task_file.read_text(encoding="utf-8")
-        m = re.search(r"<!--\s*execution_scope:\s*(\w+)\s*-->", content)
-        if m:
-            return m.group(1).strip().lower()
+        st = task_file.stat()
+        key = (st.st_mtime_ns, st.st_size)
+        cached = _SCOPE_CACHE.get(task_file)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        with task_file.open("rb") as f:
+            data = f.read(_SCOPE_HEAD_BYTES)
+            m = _SCOPE_RE.search(data)
+            if m is None and len(data) == _SCOPE_HEAD_BYTES:
+                data += f.read()
+                m = _SCOPE_RE.search(data)
+        scope = m.group(1).decode("ascii").lower() if m else "task"
+        _SCOPE_CACHE[task_file] = (key, scope)
+        return scope
     except Exception:
         pass
     return "task"
@@ -322,18 +429,19 @@ def _move_task_to_ongoing_dir(task_file: Path, ongoing_dir: Path) -> Path | None
         ts = datetime.now().strftime("%H%M%S")
         dest = ongoing_dir / f"{stem}-{ts}{suffix}"
     try:
-        shutil.move(str(task_file), str(dest))
+        task_file.rename(dest)  # 同一 agent 目录下的兄弟目录，单次 rename
     except FileNotFoundError:
+        _SCOPE_CACHE.pop(task_file, None)
         print(f"   ⚠️ 移动时文件消失，跳过: {task_file.name}")
         return None
+    _SCOPE_CACHE.pop(task_file, None)
     return dest
 
 
 def _parse_min_time(task_file: Path) -> int:
     """从任务文件中解析 <!-- min_time: X --> 元数据，返回秒数 (默认 0)"""
     try:
-        content = task_file.read_text(encoding="utf-8")
-        m = re.search(r"<!--\s*min_time:\s*(\d+)\s*-->", content)
+        m = _MIN_TIME_RE.search(task_file.read_bytes())
         if m:
             return int(m.group(1))
     except Exception:
@@ -369,7 +477,8 @@ def process_ongoing_task(ongoing_file: Path, verbose: bool = True, config: Agent
     # 解析最低执行时间
     min_time = _parse_min_time(ongoing_file)
 
-    # 初始化统计
+    # 初始化统计；使用配置的 stats_dir，无 config 时使用 ongoing 同级的 stats
+    stats_dir = config.stats_dir if config else ongoing_file.parent / "stats"
     task_stats = TaskStats(task_name=task_name, min_time=min_time)
     task_stats.mark_start()
 
@@ -393,6 +502,7 @@ def process_ongoing_task(ongoing_file: Path, verbose: bool = True, config: Agent
             return None
         return remaining + 120  # 缓冲 120 秒
 
+    task_stats.open_conversation_log(stats_dir)
     try:
         while True:
             round_num += 1
@@ -483,8 +593,6 @@ def process_ongoing_task(ongoing_file: Path, verbose: bool = True, config: Agent
         print(f"\n[{ts}] ✅ {task_name} | {round_num}轮 {task_stats.wall_clock_sec:.1f}s "
               f"| {task_stats.total_tool_calls} calls | {len(task_stats.all_files_changed)} files")
         _print_report(task_name, config)
-        # 使用配置的 stats_dir，无 config 时使用 ongoing 同级的 stats
-        stats_dir = config.stats_dir if config else ongoing_file.parent / "stats"
         _write_scanner_report(task_stats, stats_dir)
         
         # 注意：memory的更新由agent自己决定，不在这里自动更新
@@ -492,11 +600,13 @@ def process_ongoing_task(ongoing_file: Path, verbose: bool = True, config: Agent
     except Exception as e:
         # 即使异常退出，也保存已有的统计数据
         task_stats.mark_end()
-        stats_dir = config.stats_dir if config else ongoing_file.parent / "stats"
         _write_scanner_report(task_stats, stats_dir)
         ts = datetime.now().strftime("%H:%M:%S")
         print(f"\n[{ts}] ❌ {ongoing_file.name}: {e}")
         traceback.print_exc()
+    finally:
+        # KeyboardInterrupt / SystemExit 不经过上面的 mark_end，这里兜底关闭对话日志文件
+        task_stats.close_conversation_log()
 
 
 def _print_report(task_name: str, config: AgentConfig | None = None):
@@ -508,10 +618,7 @@ def _print_report(task_name: str, config: AgentConfig | None = None):
     if expected.exists():
         print(f"   📄 报告: {expected}")
     else:
-        reports = sorted(
-            [r for r in report_dir.glob("*.md") if r.stem.endswith("-report")],
-            key=lambda p: p.stat().st_mtime, reverse=True,
-        )
+        reports = newest_files(report_dir, "-report.md", 1)
         if reports:
             print(f"   📄 最新报告: {reports[0]}")
 
@@ -558,18 +665,17 @@ def _get_trigger_debug_info(config: AgentConfig) -> str:
                 info_parts.append(f"{watch_dir.name}: 目录不存在（视为空，满足条件）")
             continue
         
-        md_files = list(watch_dir.glob("*.md"))
-        file_count = len(md_files)
-        has_files = file_count > 0
+        file_count = count_files(watch_dir, ".md")
+        has_md = file_count > 0
         
         if trigger.condition == TriggerCondition.HAS_FILES:
-            if has_files:
+            if has_md:
                 info_parts.append(f"{watch_dir.name}: {file_count} 个文件 ✓")
             else:
                 all_satisfied = False
                 info_parts.append(f"{watch_dir.name}: 0 个文件 ✗")
         elif trigger.condition == TriggerCondition.IS_EMPTY:
-            if has_files:
+            if has_md:
                 all_satisfied = False
                 info_parts.append(f"{watch_dir.name}: {file_count} 个文件（不满足空条件）✗")
             else:
@@ -579,13 +685,13 @@ def _get_trigger_debug_info(config: AgentConfig) -> str:
         # 条件满足，检查是否有可执行文件
         if trigger.condition == TriggerCondition.HAS_FILES:
             if config.use_ongoing and config.processing_dir.exists() and config.processing_dir in trigger.watch_dirs:
-                ongoing_files = [f for f in config.processing_dir.glob("*.md") if _is_executable_task(f)]
+                ongoing_files = [f for f in list_files(config.processing_dir, ".md") if _is_executable_task(f)]
                 if ongoing_files:
                     info_parts.append(f"→ 触发: processing目录有 {len(ongoing_files)} 个可执行文件")
                     return " | ".join(info_parts)
             
             if config.input_dir in trigger.watch_dirs and config.input_dir.exists():
-                all_md = list(config.input_dir.glob("*.md"))
+                all_md = list_files(config.input_dir, ".md")
                 executable = [p for p in all_md if _is_executable_task(p)]
                 non_executable = [p for p in all_md if not _is_executable_task(p)]
                 
@@ -622,6 +728,25 @@ def _get_trigger_debug_info(config: AgentConfig) -> str:
     return " | ".join(info_parts)
 
 
+def _list_task_files(directory: Path) -> list[tuple[float, Path]]:
+    """按 mtime 升序列出目录下的 .md 任务文件，并清理 _SCOPE_CACHE 中该目录下已不存在的条目
+
+    任务文件可能被 agent 删除或被其它流程移走，不经过 _move_task_to_ongoing_dir；
+    每次触发扫描时按实际列表清理，缓存大小不超过监视目录中的文件数。
+    """
+    entries = files_by_mtime(directory, ".md")
+    listed = {p for _, p in entries}
+    stale = [p for p in _SCOPE_CACHE if p.parent == directory and p not in listed]
+    for p in stale:
+        del _SCOPE_CACHE[p]
+    return entries
+
+
+def _oldest_executable(entries: Iterable[tuple[float, Path]]) -> Path | None:
+    """entries 按 mtime 升序（可为惰性迭代器）：返回第一个可执行任务文件，找到即停止（不读取其余文件）"""
+    return next((f for _, f in entries if _is_executable_task(f)), None)
+
+
 def _unified_trigger(config: AgentConfig) -> list[Path]:
     """
     统一触发规则：根据TriggerConfig配置进行触发
@@ -651,15 +776,14 @@ def _unified_trigger(config: AgentConfig) -> list[Path]:
             # IS_EMPTY: 目录不存在视为空，满足条件
             continue
         
-        md_files = list(watch_dir.glob("*.md"))
-        has_files = len(md_files) > 0
+        has_md = has_files(watch_dir, ".md")
         
         if trigger.condition == TriggerCondition.HAS_FILES:
-            if not has_files:
+            if not has_md:
                 all_satisfied = False
                 break
         elif trigger.condition == TriggerCondition.IS_EMPTY:
-            if has_files:
+            if has_md:
                 all_satisfied = False
                 break
     
@@ -671,36 +795,26 @@ def _unified_trigger(config: AgentConfig) -> list[Path]:
         # 有文件时触发：返回文件列表
         # 优先处理processing目录（如果存在且use_ongoing=True）
         if config.use_ongoing and config.processing_dir.exists() and config.processing_dir in trigger.watch_dirs:
-            candidates = [
-                f for f in sorted(config.processing_dir.glob("*.md"), key=lambda p: p.stat().st_mtime)
-                if _is_executable_task(f)
-            ]
-            if candidates:
-                return [candidates[0]]
-
-        # 从input目录取文件
+            # 按修改时间从早到晚检查，找到第一个可执行文件即停止（不必读取其余文件）
+            first = _oldest_executable(_list_task_files(config.processing_dir))
+            if first is not None:
+                return [first]
+
+        # 从input目录取文件：同样按修改时间从早到晚找第一个可执行文件
         if config.input_dir in trigger.watch_dirs and config.input_dir.exists():
-            all_md = list(config.input_dir.glob("*.md"))
-            executable = [p for p in all_md if _is_executable_task(p)]
-            
-            if executable:
-                # 按修改时间排序，返回最早的文件
-                return [sorted(executable, key=lambda p: p.stat().st_mtime)[0]]
+            first = _oldest_executable(_list_task_files(config.input_dir))
+            if first is not None:
+                return [first]
         
-        # 从其他监视目录取文件
-        result = []
-        for watch_dir in trigger.watch_dirs:
-            if watch_dir == config.input_dir or watch_dir == config.processing_dir:
-                continue
-            if watch_dir.exists():
-                all_md = list(watch_dir.glob("*.md"))
-                executable = [p for p in all_md if _is_executable_task(p)]
-                if executable:
-                    result.extend(executable)
-        if result:
-            return [sorted(result, key=lambda p: p.stat().st_mtime)[0]]
-        
-        return []
+        # 从其他监视目录取文件：各目录已按 mtime 排好序，heapq.merge 惰性归并，
+        # 找到修改时间最早的可执行文件即停止，不对全部候选整体排序
+        candidates = heapq.merge(*(
+            _list_task_files(watch_dir)
+            for watch_dir in trigger.watch_dirs
+            if watch_dir != config.input_dir and watch_dir != config.processing_dir
+        ))
+        first = _oldest_executable(candidates)
+        return [first] if first is not None else []
     
     elif trigger.condition == TriggerCondition.IS_EMPTY:
         # 为空时触发：创建虚拟触发文件（如果需要）
@@ -798,13 +912,15 @@ def run_unified_scanner(config: AgentConfig, once: bool = False, verbose: bool =
 
         return result
 
-    def process_fn(file_path: Path):
+    def process_fn(file_path: Path) -> bool:
+        """处理单个触发文件；返回该文件是否已离开原位置（已被消费，可立即取下一项）"""
         from secretary.agents import set_agent_executing, increment_completed_tasks
         set_agent_executing(config.name, True)
         increment_completed_tasks(config.name)
 
         ts = datetime.now().strftime("%H:%M:%S")
-        size = file_path.stat().st_size if file_path.exists() else 0
+        existed = file_path.exists()
+        size = file_path.stat().st_size if existed else 0
         print(f"[{ts}] ▶ 处理: {file_path.name} ({size}B)")
 
         try:
@@ -815,11 +931,31 @@ def run_unified_scanner(config: AgentConfig, once: bool = False, verbose: bool =
             traceback.print_exc()
         finally:
             set_agent_executing(config.name, False)
+        # 虚拟触发文件（boss/recycler 的 marker）本就不存在，不算消费，照常休眠
+        return existed and not file_path.exists()
 
     def on_idle():
         pass  # 空闲时不打印，减少日志噪音
 
+    # 监视目录有新任务写入/移入时提前结束休眠（自定义触发的 agent 没有监视目录，照常按间隔轮询）
+    watch = list(config.trigger.watch_dirs)
+    if config.use_ongoing and config.processing_dir not in watch:
+        watch.append(config.processing_dir)
+    watcher = DirWatcher(watch if not once and config.trigger.watch_dirs else [])
+
+    # 纯目录触发 (HAS_FILES) 的 agent 只会因文件写入/移入而产生新工作：空闲时主要阻塞在 inotify 上，
+    # 只保留低频兜底重扫。自定义触发可能依赖时间等外部条件，仍按 SCAN_INTERVAL 轮询
+    idle_interval = cfg.SCAN_INTERVAL
+    if (watcher.active and not config.trigger.custom_trigger_fn
+            and config.trigger.condition == TriggerCondition.HAS_FILES):
+        idle_interval = max(cfg.SCAN_INTERVAL, _IDLE_RESCAN_SEC)
+
+    def wait(timeout: float):
+        # watch 失效（目录被删除重建）后 watcher 退化为 sleep，此时恢复常规轮询间隔
+        watcher.wait(timeout if watcher.active else min(timeout, cfg.SCAN_INTERVAL))
+
     def on_exit():
+        watcher.close()
         if config.termination == TerminationCondition.UNTIL_FILE_DELETED:
             try:
                 from secretary.agents import update_worker_status
@@ -837,6 +973,9 @@ def run_unified_scanner(config: AgentConfig, once: bool = False, verbose: bool =
         on_idle=on_idle,
         on_exit=on_exit,
         log_file=str(config.log_file) if config.log_file else None,
+        wait_fn=wait,
+        max_batch=_MAX_BATCH,
+        idle_interval_sec=idle_interval,
     )
 
 
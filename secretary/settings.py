@@ -38,22 +38,40 @@ _DEFAULTS = {
 }
 
 
+# 进程内配置缓存: (st_mtime_ns, st_size, 合并后的配置)
+# 以文件 mtime+size 作为指纹，其它进程 (如另一终端执行 kai name) 修改配置后仍能感知
+_settings_cache: tuple[int, int, dict] | None = None
+
+
 def _ensure_config_dir():
     _CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def invalidate_settings_cache():
+    """清空配置缓存（保存配置或切换工作区时调用）"""
+    global _settings_cache
+    _settings_cache = None
+
+
 def load_settings() -> dict:
-    """加载持久化配置，不存在则返回默认值"""
-    if _SETTINGS_FILE.exists():
-        try:
-            with open(_SETTINGS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            # 合并默认值 (兼容旧版配置缺少新字段)
-            merged = {**_DEFAULTS, **data}
-            return merged
-        except (json.JSONDecodeError, OSError):
-            return dict(_DEFAULTS)
-    return dict(_DEFAULTS)
+    """加载持久化配置，不存在则返回默认值（文件未变化时复用缓存，只需一次 stat）"""
+    global _settings_cache
+    try:
+        st = os.stat(_SETTINGS_FILE)
+    except OSError:
+        return dict(_DEFAULTS)
+    cached = _settings_cache
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return dict(cached[2])
+    try:
+        with open(_SETTINGS_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return dict(_DEFAULTS)
+    # 合并默认值 (兼容旧版配置缺少新字段)
+    merged = {**_DEFAULTS, **data}
+    _settings_cache = (st.st_mtime_ns, st.st_size, merged)
+    return dict(merged)
 
 
 def save_settings(settings: dict):
@@ -61,6 +79,7 @@ def save_settings(settings: dict):
     _ensure_config_dir()
     with open(_SETTINGS_FILE, "w", encoding="utf-8") as f:
         json.dump(settings, f, indent=2, ensure_ascii=False)
+    invalidate_settings_cache()
 
 
 # ============ 便捷接口 ============
@@ -12,6 +12,7 @@ import shutil
 from pathlib import Path
 
 import secretary.config as cfg
+from secretary.fs_utils import publish_file
 
 
 # ============================================================
@@ -191,6 +192,6 @@ def invoke_skill(skill_name: str, min_time: int = 0) -> Path | None:
     elif cfg.DEFAULT_MIN_TIME > 0:
         content += f"\n<!-- min_time: {cfg.DEFAULT_MIN_TIME} -->\n"
 
-    task_file.write_text(content, encoding="utf-8")
+    publish_file(task_file, content)
     return task_file
 
@@ -3,7 +3,10 @@ UI 公共工具函数
 
 提取 dashboard 和 report_viewer 中的公共代码，便于复用。
 """
+import contextlib
 import sys
+import threading
+import time
 from typing import Optional
 
 # Windows 和 Unix 的键盘输入处理
@@ -12,6 +15,13 @@ if sys.platform == "win32":
         import msvcrt
     except ImportError:
         msvcrt = None
+    try:
+        import ctypes
+        _kernel32 = ctypes.windll.kernel32
+        _STDIN_HANDLE = _kernel32.GetStdHandle(-10)  # STD_INPUT_HANDLE
+    except Exception:
+        _kernel32 = None
+        _STDIN_HANDLE = None
 else:
     try:
         import select
@@ -41,40 +51,101 @@ def setup_keyboard_input():
 
 
 def restore_keyboard_input(original_settings):
-    """恢复键盘输入设置（Unix 系统）"""
+    """恢复键盘输入设置（Unix 系统）
+
+    使用 TCSANOW 立即生效：raw 模式下本进程不向 stdin 写入，无需 TCSADRAIN 阻塞等待输出排空。
+    """
     if sys.platform != "win32" and termios and original_settings:
         try:
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, original_settings)
+            termios.tcsetattr(sys.stdin, termios.TCSANOW, original_settings)
         except Exception:
             pass
 
 
-def read_key(timeout: float = 0.1) -> Optional[str]:
+# raw_keyboard 的嵌套状态：只有最外层进入/退出时才真正 tcgetattr / tcsetattr
+_raw_lock = threading.Lock()
+_raw_depth = 0
+_raw_saved = None
+
+
+@contextlib.contextmanager
+def raw_keyboard():
+    """
+    在 with 块内让终端处于 raw 模式（Unix 系统），退出时恢复
+
+    可嵌套使用：已处于 raw 模式时内层进入/退出不再重复设置终端。
+    """
+    global _raw_depth, _raw_saved
+    with _raw_lock:
+        if _raw_depth == 0:
+            _raw_saved, _ = setup_keyboard_input()
+        _raw_depth += 1
+    try:
+        yield
+    finally:
+        with _raw_lock:
+            _raw_depth -= 1
+            if _raw_depth == 0:
+                restore_keyboard_input(_raw_saved)
+                _raw_saved = None
+
+
+def read_key(timeout: Optional[float] = 0.1, wake_fd: Optional[int] = None) -> Optional[str]:
     """
     非阻塞读取单个按键
     
     Args:
-        timeout: 超时时间（秒）
+        timeout: 超时时间（秒）；Unix 下传入 wake_fd 时可为 None，表示一直阻塞到有输入或被唤醒
+        wake_fd: Unix 下额外监听的唤醒 fd（self-pipe 读端），可读时立即返回 None
     
     Returns:
         读取到的字符，如果没有输入则返回 None
     """
     if sys.platform == "win32":
-        if msvcrt:
-            if msvcrt.kbhit():
-                try:
-                    key = msvcrt.getch()
-                    if isinstance(key, bytes):
-                        return key.decode("utf-8", errors="ignore")
-                    return key
-                except Exception:
-                    pass
+        if msvcrt and _wait_console_key(0.2 if timeout is None else timeout):
+            try:
+                key = msvcrt.getch()
+                if isinstance(key, bytes):
+                    return key.decode("utf-8", errors="ignore")
+                return key
+            except Exception:
+                pass
         return None
     else:
-        if select and select.select([sys.stdin], [], [], timeout)[0]:
+        if not select:
+            return None
+        rlist = [sys.stdin] if wake_fd is None else [sys.stdin, wake_fd]
+        ready = select.select(rlist, [], [], timeout)[0]
+        if sys.stdin in ready:
             try:
                 return sys.stdin.read(1)
             except Exception:
                 pass
         return None
 
+
+def _wait_console_key(timeout: float) -> bool:
+    """
+    Windows: 在控制台输入句柄上 WaitForSingleObject 阻塞等待按键，最长 timeout 秒
+
+    句柄在有任意输入事件（含鼠标、窗口尺寸变化）时都会被置位，因此唤醒后仍以 kbhit 确认；
+    API 不可用时退化为 kbhit 轮询。
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if msvcrt.kbhit():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        if _kernel32 is None or not _STDIN_HANDLE or _STDIN_HANDLE == -1:
+            time.sleep(min(remaining, 0.05))
+            continue
+        r = _kernel32.WaitForSingleObject(_STDIN_HANDLE, int(remaining * 1000))
+        if r == 0x102:  # WAIT_TIMEOUT
+            return msvcrt.kbhit()
+        if r != 0:  # WAIT_FAILED 等：句柄不可等待（如被重定向），退化为轮询
+            time.sleep(min(remaining, 0.05))
+        elif not msvcrt.kbhit():
+            # 非按键事件留在缓冲区中会让句柄保持置位，稍作让步避免空转
+            time.sleep(0.01)
@@ -7,16 +7,19 @@ kai 实时监控面板 — 简化的 Agent 状态监控
   - q 退出
   - 支持文本模式 (--text / --once)
 """
+import os
 import time
 import threading
 import sys
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
 # 使用公共的键盘输入处理
-from secretary.ui.common import setup_keyboard_input, restore_keyboard_input, read_key
+from secretary.ui.common import raw_keyboard, read_key
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
@@ -25,70 +28,165 @@ from rich.text import Text
 from rich import box
 
 import secretary.config as cfg
+from secretary.fs_utils import cached_count_files, count_many, is_racy
 from secretary.settings import get_cli_name
 
 
+_CONSOLE: Console | None = None
+
+
+def _get_console() -> Console:
+    """复用模块级 Console（初始化时会探测终端尺寸与颜色支持，不必每次重建）"""
+    global _CONSOLE
+    if _CONSOLE is None:
+        _CONSOLE = Console()
+    return _CONSOLE
+
+
 # ============================================================
 #  数据采集
 # ============================================================
 
+# list_workers() 结果缓存：签名为 agents.json 与各 agent tasks/ongoing 目录的 (mtime_ns, size)
+_WORKERS_CACHE: dict = {"sig": None, "val": []}
+
+
+def _workers_signature(workers: list[dict]) -> tuple:
+    """计算 list_workers() 结果的文件签名；每个路径一次 stat，不解析 JSON、不扫描目录"""
+    from secretary.agents import _queue_dirs
+    paths = [cfg.AGENTS_FILE]
+    for w in workers:
+        paths.extend(_queue_dirs(w.get("name", "")))
+    sig = [str(cfg.AGENTS_FILE)]
+    for p in paths:
+        try:
+            st = os.stat(p)
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
 def _count_workers() -> list[dict]:
-    """采集所有命名工人的状态"""
+    """采集所有命名工人的状态（注册表与队列目录均未变化时复用上次结果，调用方不应修改返回值）"""
+    cache = _WORKERS_CACHE
+    if cache["sig"] is not None and _workers_signature(cache["val"]) == cache["sig"]:
+        return cache["val"]
     try:
         from secretary.agents import list_workers
-        return list_workers()
+        workers = list_workers()
     except Exception:
         return []
+    sig = _workers_signature(workers)
+    newest = max((x[0] for x in sig[1:] if x is not None), default=0)
+    # 签名中最新 mtime 过新时不缓存，与 fs_utils 的目录缓存共用同一判定
+    if not is_racy(newest):
+        cache["sig"], cache["val"] = sig, workers
+    else:
+        cache["sig"] = None
+    return workers
+
+
+# 目录不存在的结果在面板中缓存的秒数（新建目录最多滞后这么久才计入）
+_MISSING_DIR_TTL = 10.0
+
+
+# 进程队列同步节流：距上次同步不足该秒数且 agents.json 未变化时跳过
+_SYNC_MIN_INTERVAL = 10.0
+_LAST_SYNC_TS = 0.0
+_LAST_SYNC_SIG: tuple | None = None
+
+
+def _maybe_sync(workers: list[dict], min_interval: float = _SYNC_MIN_INTERVAL):
+    """按需将 agents.json 中的进程同步到全局队列（每次同步都要逐个探测 PID，不必每帧执行）"""
+    global _LAST_SYNC_TS, _LAST_SYNC_SIG
+    try:
+        st = os.stat(cfg.AGENTS_FILE)
+        sig = (str(cfg.AGENTS_FILE), st.st_mtime_ns, st.st_size)
+    except OSError:
+        sig = None
+    now = time.monotonic()
+    if sig == _LAST_SYNC_SIG and now - _LAST_SYNC_TS < min_interval:
+        return
+    from secretary.cli import _sync_processes_to_queue
+    _sync_processes_to_queue(workers)
+    _LAST_SYNC_TS, _LAST_SYNC_SIG = now, sig
+
+
+# agent 目录列表缓存：(AGENTS_DIR 路径, st_mtime_ns) -> 除 recycler 外的 agent 目录路径
+_AGENT_DIRS_CACHE: dict = {"key": None, "dirs": ()}
+
+
+def _cached_agent_dirs() -> tuple[str, ...]:
+    """列出除 recycler 外的 agent 目录；AGENTS_DIR 的 mtime 未变化时不重新扫描"""
+    agents_dir = str(cfg.AGENTS_DIR)
+    try:
+        mtime_ns = os.stat(agents_dir).st_mtime_ns
+    except OSError:
+        return ()
+    key = (agents_dir, mtime_ns)
+    if key == _AGENT_DIRS_CACHE["key"]:
+        return _AGENT_DIRS_CACHE["dirs"]
+    try:
+        with os.scandir(agents_dir) as it:
+            # 跳过recycler自己的reports目录；is_dir 使用 scandir 缓存的 d_type，无需额外 stat
+            dirs = tuple(e.path for e in it if e.name != "recycler" and e.is_dir())
+    except OSError:
+        return ()
+    # mtime 过新时不缓存（粗粒度时间戳下同一时间片内新建的目录不会再改变 mtime）
+    racy = is_racy(mtime_ns)
+    _AGENT_DIRS_CACHE["key"] = None if racy else key
+    _AGENT_DIRS_CACHE["dirs"] = dirs
+    return dirs
 
 
 def _count_all_agent_reports() -> int:
     """统计所有agent的reports目录中的报告文件数"""
-    reports = []
-    if cfg.AGENTS_DIR.exists():
-        for agent_dir in cfg.AGENTS_DIR.iterdir():
-            if not agent_dir.is_dir():
-                continue
-            # 跳过recycler自己的reports目录
-            if agent_dir.name == "recycler":
-                continue
-            reports_dir = agent_dir / "reports"
-            if reports_dir.exists():
-                reports.extend(reports_dir.glob("*-report.md"))
-    return len(reports)
+    join = os.path.join
+    # 计数只需字符串路径，不构造 Path 对象
+    return sum(
+        cached_count_files(join(d, "reports"), "-report.md", _MISSING_DIR_TTL)
+        for d in _cached_agent_dirs()
+    )
+
+
+def _count_recycler() -> tuple[int, int]:
+    """一次统计recycler的solved/unsolved目录中的报告文件数，返回 (solved, unsolved)"""
+    # 不能用 len(os.listdir()) 省掉后缀过滤：回收时会把相关 stats 一并移入这两个目录，
+    # unsolved/ 还有 *-unsolved-reason.md 记录，目录内并非只有报告文件
+    recycler_dir = cfg.AGENTS_DIR / "recycler"
+    solved, unsolved = count_many(
+        [recycler_dir / "solved", recycler_dir / "unsolved"], "-report.md", _MISSING_DIR_TTL
+    )
+    return solved, unsolved
 
 
 def _count_recycler_solved() -> int:
     """统计recycler的solved目录中的报告文件数"""
-    recycler_dir = cfg.AGENTS_DIR / "recycler"
-    solved_dir = recycler_dir / "solved"
-    if solved_dir.exists():
-        return len(list(solved_dir.glob("*-report.md")))
-    return 0
+    return _count_recycler()[0]
 
 
 def _count_recycler_unsolved() -> int:
     """统计recycler的unsolved目录中的报告文件数"""
-    recycler_dir = cfg.AGENTS_DIR / "recycler"
-    unsolved_dir = recycler_dir / "unsolved"
-    if unsolved_dir.exists():
-        return len(list(unsolved_dir.glob("*-report.md")))
-    return 0
+    return _count_recycler()[1]
 
 
-def collect_status() -> dict:
-    """采集所有文件夹状态 (用于状态栏)"""
-    workers = _count_workers()
+def collect_status(workers: list[dict] | None = None) -> dict:
+    """采集所有文件夹状态 (用于状态栏)；已持有本轮 list_workers() 结果时可直接传入"""
+    if workers is None:
+        workers = _count_workers()
 
     # 所有工人的任务数总和
     worker_tasks = sum(w.get("pending_count", 0) for w in workers)
     worker_ongoing = sum(w.get("ongoing_count", 0) for w in workers)
 
+    solved, unsolved = _count_recycler()
     return {
         "tasks": worker_tasks,
         "ongoing": worker_ongoing,
         "report": _count_all_agent_reports(),
-        "solved": _count_recycler_solved(),
-        "unsolved": _count_recycler_unsolved(),
+        "solved": solved,
+        "unsolved": unsolved,
     }
 
 
@@ -96,25 +194,55 @@ def collect_status() -> dict:
 #  渲染组件
 # ============================================================
 
+_TYPE_ICONS = {
+    "secretary": "🤖",
+    "worker": "👷",
+    "boss": "👔",
+    "recycler": "♻️",
+}
+_STATUS_ICONS = {"idle": "💤", "busy": "⚙️", "offline": "📴"}
 
+# 监控面板表格列: (标题, 样式, 对齐, 宽度)
+_COLS = (
+    ("Agent", "cyan", "left", 15),
+    ("类型", "magenta", "left", 10),
+    ("执行中", "cyan", "center", 8),
+    ("已完成", "green", "right", 8),
+    ("状态", "dim", "left", 4),
+    ("PID", "dim", "right", 8),
+)
 
-def _build_simple_dashboard(refresh_interval: float = 2.0) -> Layout:
-    """构建简化的监控面板：显示agent及其任务统计和进程信息（合并到一个表）"""
-    from secretary.agents import list_workers
-    
-    workers = list_workers()
-    
-    # 获取活跃进程：完全基于全局队列
-    active_procs = []
+
+
+def _collect_active_procs(workers: list[dict]) -> list[dict]:
+    """获取活跃进程：完全基于全局队列"""
     try:
-        from secretary.cli import _get_active_processes, _sync_processes_to_queue
-        # 先同步agents.json到队列（确保队列完整）
-        _sync_processes_to_queue()
+        from secretary.cli import _get_active_processes
+        # 先同步agents.json到队列（确保队列完整，按需节流），复用本轮的 workers
+        _maybe_sync(workers)
         # 然后从队列获取
-        active_procs = _get_active_processes()
+        return _get_active_processes()
     except Exception:
-        active_procs = []
-    
+        return []
+
+
+def _table_signature(workers: list[dict], active_procs: list[dict]) -> tuple:
+    """表格所展示数据的签名，未变化时无需重建表格"""
+    return (
+        tuple(
+            (w.get("name"), w.get("type"), w.get("executing"), w.get("completed_tasks"),
+             w.get("status"), w.get("pid"))
+            for w in workers
+        ),
+        tuple((p.get("name"), p.get("pid")) for p in active_procs),
+    )
+
+
+def _build_agent_table(workers: list[dict], active_procs: list[dict]) -> Table:
+    """构建 agent 状态与进程表（面板中随数据变化的部分）
+
+    rich 的 Table 没有公开的清空行接口，因此数据变化时只重建这张表，外层 Panel 复用。
+    """
     # 创建进程PID映射（快速查找）
     proc_pid_map = {proc.get("name"): proc.get("pid") for proc in active_procs}
     
@@ -125,30 +253,20 @@ def _build_simple_dashboard(refresh_interval: float = 2.0) -> Layout:
         box=box.ROUNDED,
         expand=True,
     )
-    table.add_column("Agent", style="cyan", width=15)
-    table.add_column("类型", style="magenta", width=10)
-    table.add_column("执行中", style="cyan", justify="center", width=8)
-    table.add_column("已完成", style="green", justify="right", width=8)
-    table.add_column("状态", style="dim", width=4)
-    table.add_column("PID", style="dim", justify="right", width=8)
+    for header, style, justify, width in _COLS:
+        table.add_column(header, style=style, justify=justify, width=width)
     
     if not workers:
         table.add_row("(无agent)", "", "", "", "", "")
     else:
-        type_icons = {
-            "secretary": "🤖",
-            "worker": "👷",
-            "boss": "👔",
-            "recycler": "♻️",
-        }
         for w in workers:
             agent_name = w.get("name", "unknown")
             agent_type = w.get("type", "unknown")
             executing = w.get("executing", False)
             completed = w.get("completed_tasks", 0)
-            status_icon = {"idle": "💤", "busy": "⚙️", "offline": "📴"}.get(w.get("status", ""), "❓")
+            status_icon = _STATUS_ICONS.get(w.get("status", ""), "❓")
             
-            type_icon = type_icons.get(agent_type, "❓")
+            type_icon = _TYPE_ICONS.get(agent_type, "❓")
             type_display = f"{type_icon} {agent_type}"
             
             # 执行中显示勾或叉
@@ -167,28 +285,64 @@ def _build_simple_dashboard(refresh_interval: float = 2.0) -> Layout:
                 pid_display,
             )
     
-    # 底部提示：第一行 时间/刷新/退出，第二行 日志与报告引导
+    return table
+
+
+def _fill_clock_footer(footer1: Text, refresh_interval: float) -> Text:
+    """原地重写底部第一行：时间/刷新/退出"""
     now = datetime.now().strftime("%H:%M:%S")
-    name = get_cli_name()
-    footer1 = Text(justify="center")
+    footer1.plain = ""
     footer1.append(f" ⏱  {now} ", style="dim")
     footer1.append("│", style="dim")
     footer1.append(f" 每 {refresh_interval}s 刷新 ", style="dim")
     footer1.append("│", style="dim")
     footer1.append(" q 退出 ", style="dim italic")
+    return footer1
+
+
+def _build_hint_footer(name: str) -> Text:
+    """底部第二行：日志与报告引导"""
     footer2 = Text(justify="center")
     footer2.append(f" 日志: {name} check <名> ", style="dim")
     footer2.append("│", style="dim")
     footer2.append(" 报告: (待接 report 命令) ", style="dim")
-    
+    return footer2
+
+
+@dataclass
+class _DashboardView:
+    """监控面板骨架：Layout/Panel/footer 只构建一次，刷新时只替换表格并原地改写时间行"""
+    layout: Layout
+    panel: Panel
+    clock: Text
+    sig: tuple | None = None
+
+    def refresh(self, refresh_interval: float):
+        workers = _count_workers()
+        active_procs = _collect_active_procs(workers)
+        sig = _table_signature(workers, active_procs)
+        if sig != self.sig:
+            self.panel.renderable = _build_agent_table(workers, active_procs)
+            self.sig = sig
+        _fill_clock_footer(self.clock, refresh_interval)
+
+
+def _new_dashboard_view(refresh_interval: float = 2.0, cli_name: str | None = None) -> _DashboardView:
+    """构建监控面板骨架并填充首帧数据
+
+    cli_name 由 run_monitor 在启动时取一次传入，刷新时不再重复读取配置。
+    """
+    panel = Panel(Text(), title="[bold]Agent状态与进程[/]", border_style="cyan")
+    clock = Text(justify="center")
     layout = Layout()
     layout.split_column(
-        Layout(Panel(table, title="[bold]Agent状态与进程[/]", border_style="cyan")),
-        Layout(footer1, size=1),
-        Layout(footer2, size=1),
+        Layout(panel),
+        Layout(clock, size=1),
+        Layout(_build_hint_footer(cli_name or get_cli_name()), size=1),
     )
-    
-    return layout
+    view = _DashboardView(layout=layout, panel=panel, clock=clock)
+    view.refresh(refresh_interval)
+    return view
 
 
 
@@ -197,9 +351,15 @@ def _build_simple_dashboard(refresh_interval: float = 2.0) -> Layout:
 #  一行式状态栏 (用于交互模式等)
 # ============================================================
 
+_STATUS_KEYS = ("tasks", "ongoing", "report", "solved", "unsolved")
+
+
 def build_status_line() -> Text:
     """构建一行式状态摘要 (用于嵌入交互模式)"""
-    status = collect_status()
+    return _status_line_from(collect_status())
+
+
+def _status_line_from(status: dict) -> Text:
     line = Text()
     line.append(" 📂 ", style="yellow")
     line.append(str(status["tasks"]), style="bold yellow")
@@ -214,15 +374,21 @@ def build_status_line() -> Text:
     return line
 
 
-def print_status_line():
-    """打印一行状态栏到终端"""
-    console = Console()
-    line = build_status_line()
+@lru_cache(maxsize=256)
+def _status_bar_panel(counts: tuple[int, ...]) -> Panel:
+    """按计数元组缓存状态栏 Panel：计数不变时直接复用已构建的 rich 对象"""
+    line = _status_line_from(dict(zip(_STATUS_KEYS, counts)))
     bar = Text()
     bar.append("┃ ", style="dim")
     bar.append_text(line)
     bar.append(" ┃", style="dim")
-    console.print(Panel(bar, box=box.HORIZONTALS, style="dim", expand=True, padding=0))
+    return Panel(bar, box=box.HORIZONTALS, style="dim", expand=True, padding=0)
+
+
+def print_status_line():
+    """打印一行状态栏到终端"""
+    status = collect_status()
+    _get_console().print(_status_bar_panel(tuple(status[k] for k in _STATUS_KEYS)))
 
 
 # ============================================================
@@ -236,7 +402,7 @@ def print_status_text():
     name = get_cli_name()
     workers = list_workers()
 
-    console = Console()
+    console = _get_console()
     table = Table(
         title=f"📊 {name} Agent 状态 — {cfg.BASE_DIR}",
         box=box.ROUNDED,
@@ -250,12 +416,10 @@ def print_status_text():
     table.add_column("状态")
     table.add_column("PID", justify="right", style="dim")
 
-    type_icons = {"secretary": "🤖", "worker": "👷", "boss": "👔", "recycler": "♻️"}
-
     active_procs = []
     try:
-        from secretary.cli import _get_active_processes, _sync_processes_to_queue
-        _sync_processes_to_queue()
+        from secretary.cli import _get_active_processes
+        _maybe_sync(workers)
         active_procs = _get_active_processes()
     except Exception:
         pass
@@ -270,7 +434,7 @@ def print_status_text():
             pending = w.get("pending_count", 0)
             ongoing = w.get("ongoing_count", 0)
             completed = w.get("completed_tasks", 0)
-            icon = type_icons.get(agent_type, "❓")
+            icon = _TYPE_ICONS.get(agent_type, "❓")
             pid = proc_pid_map.get(agent_name) or w.get("pid")
 
             status = w.get("status", "")
@@ -295,11 +459,10 @@ def print_status_text():
                 str(pid) if pid else "-",
             )
 
-    console.print()
-    console.print(table)
-
-    running_count = len([p for p in active_procs])
-    console.print(f"  [dim]活跃进程: {running_count} 个  |  {name} check <名> 查看日志[/]\n")
+    running_count = len(active_procs)
+    footer = Text.from_markup(f"  [dim]活跃进程: {running_count} 个  |  {name} check <名> 查看日志[/]\n")
+    # 空行 + 表格 + 底部提示合并为一次输出
+    console.print(Group(Text(), table, footer))
 
 
 # ============================================================
@@ -317,39 +480,53 @@ def run_monitor(refresh_interval: float = 2.0, text_mode: bool = False, once: bo
         print_status_text()
         return
 
-    console = Console()
+    console = _get_console()
     stop = threading.Event()
+    name = get_cli_name()
+
+    # Unix: self-pipe 唤醒按键线程，select 无需超时轮询 stop；Windows 仍按 0.2s 复查
+    wake_r, wake_w = os.pipe() if sys.platform != "win32" else (None, None)
+    key_timeout = None if wake_r is not None else 0.2
 
-    # 后台线程: 非阻塞读取按键（使用公共函数）
+    def _signal_stop():
+        stop.set()
+        if wake_w is not None:
+            try:
+                os.write(wake_w, b"x")
+            except OSError:
+                pass
+
+    # 后台线程: 阻塞读取按键（使用公共函数）
     def _key_listener():
-        original_settings, success = setup_keyboard_input()
         try:
-            while not stop.is_set():
-                ch = read_key(timeout=0.2)
-                if ch:
-                    ch_lower = ch.lower()
-                    if ch_lower == "q" or ch == "\x1b":  # q 或 ESC
-                        stop.set()
-                        return
+            with raw_keyboard():
+                while not stop.is_set():
+                    ch = read_key(timeout=key_timeout, wake_fd=wake_r)
+                    if ch:
+                        ch_lower = ch.lower()
+                        if ch_lower == "q" or ch == "\x1b":  # q 或 ESC
+                            stop.set()
+                            return
         except Exception:
             pass
-        finally:
-            restore_keyboard_input(original_settings)
 
     listener = threading.Thread(target=_key_listener, daemon=True)
     listener.start()
 
     try:
+        view = _new_dashboard_view(refresh_interval, name)
+        # 关闭自动刷新：每个刷新周期只在数据更新后重绘一次，避免重复输出整屏
         with Live(
-            _build_simple_dashboard(refresh_interval),
+            view.layout,
             console=console,
-            refresh_per_second=1,
+            auto_refresh=False,
             screen=True,
         ) as live:
             while not stop.is_set():
                 stop.wait(refresh_interval)
                 if not stop.is_set():
-                    live.update(_build_simple_dashboard(refresh_interval))
+                    view.refresh(refresh_interval)
+                    live.refresh()
     except KeyboardInterrupt:
         pass
     except Exception as e:
@@ -358,8 +535,11 @@ def run_monitor(refresh_interval: float = 2.0, text_mode: bool = False, once: bo
         print_status_text()
         return
     finally:
-        stop.set()
+        _signal_stop()
         listener.join(timeout=1)
-        name = get_cli_name()
+        if not listener.is_alive():  # 线程仍阻塞在 select 时不关闭，避免 fd 被复用
+            for fd in (wake_r, wake_w):
+                if fd is not None:
+                    os.close(fd)
         console.print(f"\n👋 {name} 监控面板已退出\n")
 
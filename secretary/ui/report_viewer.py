@@ -8,15 +8,20 @@
   - 按 'n' 查看下一个任务
   - 按 'q' 退出
 """
+import os
+import re
 import time
 import threading
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
 # 使用公共的键盘输入处理
-from secretary.ui.common import setup_keyboard_input, restore_keyboard_input, read_key
+from secretary.ui.common import raw_keyboard, read_key
 
 from rich.console import Console
 from rich.live import Live
@@ -27,142 +32,140 @@ from rich.markdown import Markdown
 from rich import box
 
 import secretary.config as cfg
-from secretary.agents import _worker_tasks_dir, _worker_ongoing_dir, get_worker
+from secretary.agents import _worker_tasks_dir, _worker_ongoing_dir, _worker_reports_dir, get_worker
 
 
-def _collect_worker_tasks(worker_name: str) -> list[dict]:
-    """收集 worker 的所有任务，按时间排序（最新的在前）"""
-    tasks = []
-    
-    # 1. 待处理任务
-    tasks_dir = _worker_tasks_dir(worker_name)
-    if tasks_dir.exists():
-        for task_file in tasks_dir.glob("*.md"):
-            mtime = task_file.stat().st_mtime
-            try:
-                content = task_file.read_text(encoding="utf-8")
-                lines = content.splitlines()
-                title = ""
-                for line in lines[:10]:
-                    if line.strip().startswith("#"):
-                        title = line.strip().lstrip("#").strip()
-                        break
-                if not title and lines:
-                    title = lines[0].strip()[:50]
-                if not title:
-                    title = task_file.stem
-            except Exception:
-                title = task_file.stem
-                content = ""
-            
-            tasks.append({
-                "name": task_file.stem,
-                "file": task_file,
-                "type": "pending",
-                "mtime": mtime,
-                "title": title,
-                "content": content,
-            })
-    
-    # 2. 执行中任务
-    ongoing_dir = _worker_ongoing_dir(worker_name)
-    if ongoing_dir.exists():
-        for task_file in ongoing_dir.glob("*.md"):
-            mtime = task_file.stat().st_mtime
-            try:
-                content = task_file.read_text(encoding="utf-8")
-                lines = content.splitlines()
-                title = ""
-                for line in lines[:10]:
-                    if line.strip().startswith("#"):
-                        title = line.strip().lstrip("#").strip()
-                        break
-                if not title and lines:
-                    title = lines[0].strip()[:50]
-                if not title:
-                    title = task_file.stem
-            except Exception:
-                title = task_file.stem
-                content = ""
-            
-            tasks.append({
-                "name": task_file.stem,
-                "file": task_file,
-                "type": "ongoing",
-                "mtime": mtime,
-                "title": title,
-                "content": content,
-            })
-    
-    # 3. 已完成报告（从worker自己的reports目录读取）
-    from secretary.agents import _worker_reports_dir
-    reports_dir = _worker_reports_dir(worker_name)
-    if reports_dir.exists():
-        for report_file in reports_dir.glob("*-report.md"):
-            task_name = report_file.stem.replace("-report", "")
-            mtime = report_file.stat().st_mtime
-            try:
-                content = report_file.read_text(encoding="utf-8")
-                lines = content.splitlines()
-                title = ""
-                for line in lines[:10]:
-                    if line.strip().startswith("#"):
-                        title = line.strip().lstrip("#").strip()
-                        break
-                if not title and lines:
-                    title = lines[0].strip()[:50]
-                if not title:
-                    title = task_name
-            except Exception:
-                title = task_name
-                content = ""
-            
-            tasks.append({
-                "name": task_name,
-                "file": report_file,
-                "type": "completed",
-                "mtime": mtime,
-                "title": title,
-                "content": content,
-            })
-    
-    # 4. 已解决报告（从recycler的solved目录读取）
-    recycler_dir = cfg.AGENTS_DIR / "recycler"
-    solved_dir = recycler_dir / "solved"
-    if solved_dir.exists():
-        for report_file in solved_dir.glob("*-report.md"):
-            task_name = report_file.stem.replace("-report", "")
-            mtime = report_file.stat().st_mtime
+@lru_cache(maxsize=4096)
+def _fmt_time(mtime_int: int) -> str:
+    """格式化文件修改时间（按整秒缓存，重复渲染同一任务时不再构造 datetime）"""
+    return datetime.fromtimestamp(mtime_int).strftime("%Y-%m-%d %H:%M:%S")
+
+
+# 任务文件解析缓存: 路径 -> (st_mtime_ns, st_size, 标题, 内容)；文件未变化时不再读取与解析
+_TASK_META_CACHE: dict[str, tuple[int, int, str, str]] = {}
+
+
+# 前 10 行的范围，以及其中第一个以 # 开头的行（均在 C 层扫描，不为整份内容构造行列表）
+_HEAD_LINES_RE = re.compile(r"(?:[^\n]*\n){0,9}[^\n]*")
+_HEADING_RE = re.compile(r"^[ \t]*#.*", re.M)
+
+# 任务面板最多展示的前 50 行
+_PANEL_LINES_RE = re.compile(r"(?:[^\n]*\n){0,49}[^\n]*")
+
+
+def _parse_title(content: str, default_title: str) -> str:
+    """取前 10 行中第一个 Markdown 标题；没有时用首行（截断到 50 字），再退回 default_title"""
+    head_end = _HEAD_LINES_RE.match(content).end()
+    m = _HEADING_RE.search(content, 0, head_end)
+    title = m.group().strip().lstrip("#").strip() if m else ""
+    if not title and content:
+        title = content.partition("\n")[0].strip()[:50]
+    return title or default_title
+
+
+def _load_task_meta(path: Path, st: os.stat_result, default_title: str) -> tuple[str, str]:
+    """读取任务/报告文件，返回 (标题, 内容)
+
+    以 (mtime_ns, size) 为键缓存解析结果，重复收集时未变化的文件不再读取。
+    """
+    key = str(path)
+    hit = _TASK_META_CACHE.get(key)
+    if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2], hit[3]
+    try:
+        # 已知文件大小，直接 os.read 一次读入再解码，省去 TextIOWrapper 等包装对象
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            data = os.read(fd, st.st_size)
+        finally:
+            os.close(fd)
+    except OSError:
+        return default_title, ""
+    content = data.decode("utf-8", errors="replace")
+    title = _parse_title(content, default_title)
+    _TASK_META_CACHE[key] = (st.st_mtime_ns, st.st_size, title, content)
+    return title, content
+
+
+def _scan_task_dir(directory: Path, suffix: str, task_type: str) -> tuple[list[dict], set[str]]:
+    """列出目录下以 suffix 结尾的文件作为 task_type 类任务，返回 (任务列表, 访问过的路径)
+
+    os.scandir 一次列出目录，mtime 取自同一个 DirEntry 的 stat；报告文件的任务名去掉 -report 后缀。
+    目录不存在时返回空结果。
+    """
+    tasks: list[dict] = []
+    seen: set[str] = set()
+    try:
+        it = os.scandir(directory)
+    except (FileNotFoundError, NotADirectoryError):
+        return tasks, seen
+    with it:
+        for entry in it:
+            if not entry.name.endswith(suffix):
+                continue
             try:
-                content = report_file.read_text(encoding="utf-8")
-                lines = content.splitlines()
-                title = ""
-                for line in lines[:10]:
-                    if line.strip().startswith("#"):
-                        title = line.strip().lstrip("#").strip()
-                        break
-                if not title and lines:
-                    title = lines[0].strip()[:50]
-                if not title:
-                    title = task_name
-            except Exception:
-                title = task_name
-                content = ""
-            
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue  # 扫描期间被移走
+            path = directory / entry.name
+            seen.add(str(path))
+            name = path.stem.replace("-report", "") if suffix == "-report.md" else path.stem
+            title, content = _load_task_meta(path, st, name)
             tasks.append({
-                "name": task_name,
-                "file": report_file,
-                "type": "solved",
-                "mtime": mtime,
+                "name": name,
+                "file": path,
+                "type": task_type,
+                "mtime": st.st_mtime,
                 "title": title,
                 "content": content,
             })
-    
+    return tasks, seen
+
+
+# 任务来源表: (worker 名 -> 目录, 文件后缀, 任务类型)；新增来源只需在此加一行
+_TASK_SOURCES = (
+    (_worker_tasks_dir, ".md", "pending"),
+    (_worker_ongoing_dir, ".md", "ongoing"),
+    (_worker_reports_dir, "-report.md", "completed"),
+    (lambda _worker_name: cfg.AGENTS_DIR / "recycler" / "solved", "-report.md", "solved"),
+)
+
+
+def _collect_worker_tasks(worker_name: str) -> list[dict]:
+    """收集 worker 的所有任务，按时间排序（最新的在前）
+
+    来源：待处理 tasks/、执行中 ongoing/、已完成报告（worker 自己的 reports/）、
+    已解决报告（recycler 的 solved/）。
+    """
+    sources = [(dir_fn(worker_name), suffix, task_type) for dir_fn, suffix, task_type in _TASK_SOURCES]
+    # 四个目录互不相交，并发扫描：工作区在网络文件系统上时，各目录的列目录与读文件延迟可以重叠
+    with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+        results = list(pool.map(lambda src: _scan_task_dir(*src), sources))
+    tasks: list[dict] = []
+    seen: set[str] = set()
+    for dir_tasks, dir_seen in results:
+        tasks.extend(dir_tasks)
+        seen |= dir_seen
+
+    # 已不在任何目录中的文件（被移走/删除）不再保留缓存
+    for key in _TASK_META_CACHE.keys() - seen:
+        del _TASK_META_CACHE[key]
+
     # 按时间排序（最新的在前）
-    tasks.sort(key=lambda x: x["mtime"], reverse=True)
+    tasks.sort(key=itemgetter("mtime"), reverse=True)
     return tasks
 
 
+# 任务面板缓存: (名称, 类型, mtime, 序号, 总数) -> Panel；p/n 来回切换时复用已构建的 Markdown 面板
+_TASK_PANEL_CACHE: dict[tuple, Panel] = {}
+_TASK_PANEL_CACHE_MAX = 32
+
+# 界面无按键时，worker 统计信息的刷新间隔（秒）
+_STATS_REFRESH_SEC = 2.0
+
+
 def _build_task_panel(task: dict, index: int, total: int) -> Panel:
     """构建任务详情面板"""
     task_type = task["type"]
@@ -181,18 +184,18 @@ def _build_task_panel(task: dict, index: int, total: int) -> Panel:
     title_text.append(task["name"], style="bold")
     
     # 时间
-    mtime = datetime.fromtimestamp(task["mtime"])
-    time_str = mtime.strftime("%Y-%m-%d %H:%M:%S")
+    time_str = _fmt_time(int(task["mtime"]))
     
     # 内容
     content = task.get("content", "")
     if content:
-        # 限制内容长度，避免过长
-        lines = content.splitlines()
-        if len(lines) > 50:
-            content = "\n".join(lines[:50]) + "\n\n... (内容已截断，共 {} 行) ...".format(len(lines))
+        # 限制内容长度，避免过长；只定位第 50 行的结尾，不为整份内容构造行列表
+        head = _PANEL_LINES_RE.match(content).group()
+        if content[len(head):] not in ("", "\n"):
+            total_lines = content.count("\n") + (not content.endswith("\n"))
+            content = head + "\n\n... (内容已截断，共 {} 行) ...".format(total_lines)
         try:
-            content_panel = Markdown(content)
+            content_panel = Markdown(content, code_theme="ansi_dark", hyperlinks=False)
         except Exception:
             content_panel = Text(content)
     else:
@@ -249,7 +252,13 @@ def _build_report_dashboard(worker_name: str, current_index: int, tasks: list[di
     root["header"].update(Panel(header_text, style="bold", border_style="bright_blue"))
     
     # Task Panel
-    root["task"].update(_build_task_panel(current_task, current_index, total))
+    key = (current_task["name"], current_task["type"], current_task["mtime"], current_index, total)
+    panel = _TASK_PANEL_CACHE.get(key)
+    if panel is None:
+        if len(_TASK_PANEL_CACHE) >= _TASK_PANEL_CACHE_MAX:
+            _TASK_PANEL_CACHE.pop(next(iter(_TASK_PANEL_CACHE)))
+        panel = _TASK_PANEL_CACHE[key] = _build_task_panel(current_task, current_index, total)
+    root["task"].update(panel)
     
     # Footer
     footer = Text(justify="center")
@@ -285,46 +294,78 @@ def run_interactive_report(worker_name: str):
         console.print(f"[yellow]⚠️  {worker_name} 暂无任务[/]")
         return
     
+    # 按键切换任务或退出时置位，主循环据此立即重绘，无按键时不做轮询
+    changed = threading.Event()
+
+    # Unix: self-pipe 唤醒按键线程，select 无需超时轮询 stop；Windows 仍按 0.2s 复查
+    wake_r, wake_w = os.pipe() if sys.platform != "win32" else (None, None)
+    key_timeout = None if wake_r is not None else 0.2
+
+    def _signal_stop():
+        stop.set()
+        changed.set()
+        if wake_w is not None:
+            try:
+                os.write(wake_w, b"x")
+            except OSError:
+                pass
+
     # 键盘监听（使用公共函数）
     def _key_listener():
-        original_settings, success = setup_keyboard_input()
         try:
-            while not stop.is_set():
-                ch = read_key(timeout=0.1)
-                if ch:
-                    ch_lower = ch.lower()
-                    if ch_lower == "q":
-                        stop.set()
-                        return
-                    elif ch_lower == "p":  # previous
-                        if current_index[0] > 0:
-                            current_index[0] -= 1
-                    elif ch_lower == "n":  # next
-                        if current_index[0] < len(tasks) - 1:
-                            current_index[0] += 1
+            with raw_keyboard():
+                while not stop.is_set():
+                    ch = read_key(timeout=key_timeout, wake_fd=wake_r)
+                    if ch:
+                        ch_lower = ch.lower()
+                        if ch_lower == "q":
+                            _signal_stop()
+                            return
+                        elif ch_lower == "p":  # previous
+                            if current_index[0] > 0:
+                                current_index[0] -= 1
+                                changed.set()
+                        elif ch_lower == "n":  # next
+                            if current_index[0] < len(tasks) - 1:
+                                current_index[0] += 1
+                                changed.set()
         except Exception:
             pass
-        finally:
-            restore_keyboard_input(original_settings)
     
     listener = threading.Thread(target=_key_listener, daemon=True)
     listener.start()
     
     try:
+        # 仅在切换任务或统计信息到期时重建并重绘，空闲时不再每 0.1 秒重新渲染 Markdown
+        shown_index = current_index[0]
+        next_stats_at = time.monotonic() + _STATS_REFRESH_SEC
         with Live(
-            _build_report_dashboard(worker_name, current_index[0], tasks),
+            _build_report_dashboard(worker_name, shown_index, tasks),
             console=console,
-            refresh_per_second=10,  # 高刷新率以响应按键
+            auto_refresh=False,
             screen=True,
         ) as live:
+            live.refresh()
             while not stop.is_set():
-                stop.wait(0.1)  # 快速刷新
-                if not stop.is_set():
-                    live.update(_build_report_dashboard(worker_name, current_index[0], tasks))
+                # 阻塞到按键切换任务或统计信息到期
+                changed.wait(max(0.0, next_stats_at - time.monotonic()))
+                changed.clear()
+                if stop.is_set():
+                    break
+                index = current_index[0]
+                now = time.monotonic()
+                if index != shown_index or now >= next_stats_at:
+                    live.update(_build_report_dashboard(worker_name, index, tasks), refresh=True)
+                    shown_index = index
+                    next_stats_at = now + _STATS_REFRESH_SEC
     except KeyboardInterrupt:
         pass
     finally:
-        stop.set()
+        _signal_stop()
         listener.join(timeout=1)
+        if not listener.is_alive():  # 线程仍阻塞在 select 时不关闭，避免 fd 被复用
+            for fd in (wake_r, wake_w):
+                if fd is not None:
+                    os.close(fd)
         console.print(f"\n👋 {worker_name} 的报告查看器已退出\n")
 